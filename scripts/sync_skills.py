@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import fnmatch
 import json
 import shutil
 import sys
@@ -11,6 +12,7 @@ from pathlib import Path
 IGNORED_FILE_NAMES = {".DS_Store"}
 IGNORED_DIR_NAMES = {"__pycache__"}
 IGNORED_SUFFIXES = {".pyc"}
+SYNC_MANIFEST_NAME = "sync-manifest.json"
 
 
 def parse_args() -> argparse.Namespace:
@@ -31,6 +33,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Show planned changes without writing files.",
     )
+    parser.add_argument(
+        "--size-report",
+        action="store_true",
+        help="Add per-skill shipped/excluded file counts and bytes to the summary.",
+    )
     return parser.parse_args()
 
 
@@ -50,7 +57,7 @@ def target_skills_root(workspace_root: Path) -> Path:
     return workspace_root / ".agents" / "skills" / "super-dev"
 
 
-def iter_source_files(root: Path) -> dict[Path, Path]:
+def iter_candidate_files(root: Path) -> dict[Path, Path]:
     files: dict[Path, Path] = {}
     for path in sorted(root.rglob("*")):
         if path.is_symlink():
@@ -66,6 +73,93 @@ def iter_source_files(root: Path) -> dict[Path, Path]:
     return files
 
 
+def load_sync_manifest(manifest_path: Path) -> list[str]:
+    payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    exclude = payload.get("exclude", []) if isinstance(payload, dict) else None
+    if not isinstance(exclude, list) or not all(isinstance(item, str) for item in exclude):
+        raise ValueError(f"Invalid sync manifest, expected {{\"exclude\": [patterns]}}: {manifest_path}")
+    return exclude
+
+
+def collect_sync_manifests(root: Path) -> dict[Path, list[str]]:
+    manifests: dict[Path, list[str]] = {}
+    for manifest_path in sorted(root.rglob(SYNC_MANIFEST_NAME)):
+        if manifest_path.is_file() and not manifest_path.is_symlink():
+            manifests[manifest_path.parent.relative_to(root)] = load_sync_manifest(manifest_path)
+    return manifests
+
+
+def matches_exclude(relative_path: str, patterns: list[str]) -> bool:
+    # "dir/" excludes a whole subtree; anything else is an fnmatch glob on the
+    # path relative to the manifest's directory.
+    for pattern in patterns:
+        if pattern.endswith("/"):
+            if relative_path.startswith(pattern):
+                return True
+        elif fnmatch.fnmatchcase(relative_path, pattern):
+            return True
+    return False
+
+
+def is_manifest_excluded(relative_path: Path, manifests: dict[Path, list[str]]) -> bool:
+    if relative_path.name == SYNC_MANIFEST_NAME:
+        return True
+    for base, patterns in manifests.items():
+        if base in relative_path.parents and matches_exclude(
+            relative_path.relative_to(base).as_posix(), patterns
+        ):
+            return True
+    return False
+
+
+def plan_source_files(root: Path) -> tuple[dict[Path, Path], dict[Path, Path]]:
+    # A directory may hold a sync-manifest.json listing maintainer-only paths
+    # (relative to that directory) that never reach workspaces; the manifest
+    # itself is never copied either.
+    manifests = collect_sync_manifests(root)
+    shipped: dict[Path, Path] = {}
+    excluded: dict[Path, Path] = {}
+    for relative_path, path in iter_candidate_files(root).items():
+        if is_manifest_excluded(relative_path, manifests):
+            excluded[relative_path] = path
+        else:
+            shipped[relative_path] = path
+    return shipped, excluded
+
+
+def iter_source_files(root: Path) -> dict[Path, Path]:
+    return plan_source_files(root)[0]
+
+
+def build_size_report(root: Path) -> dict[str, object]:
+    skill_dirs = {path.parent.relative_to(root) for path in root.rglob("SKILL.md")}
+    shipped, excluded = plan_source_files(root)
+    rows: dict[str, dict[str, object]] = {}
+
+    def owner(relative_path: Path) -> str:
+        for parent in relative_path.parents:
+            if parent in skill_dirs:
+                return parent.as_posix()
+        return "."
+
+    for kind, files in (("shipped", shipped), ("excluded", excluded)):
+        for relative_path, path in files.items():
+            name = owner(relative_path)
+            row = rows.setdefault(
+                name,
+                {"path": name, "shipped_files": 0, "shipped_bytes": 0, "excluded_files": 0, "excluded_bytes": 0},
+            )
+            row[f"{kind}_files"] += 1
+            row[f"{kind}_bytes"] += path.stat().st_size
+
+    skills = sorted(rows.values(), key=lambda row: (-row["shipped_bytes"], row["path"]))
+    totals = {
+        key: sum(row[key] for row in skills)
+        for key in ("shipped_files", "shipped_bytes", "excluded_files", "excluded_bytes")
+    }
+    return {"source_root": str(root), "skills": skills, "total": totals}
+
+
 def iter_target_files(root: Path) -> dict[Path, Path]:
     files: dict[Path, Path] = {}
     if not root.exists():
@@ -180,6 +274,9 @@ def sync_skills(
 ) -> dict[str, object]:
     source_files = iter_source_files(source)
     target_files = iter_target_files(target)
+    # Manifest-excluded paths are never shipped, so whatever sits there in a
+    # workspace (e.g. caches a skill builds at runtime) belongs to it.
+    manifests = collect_sync_manifests(source)
 
     copied: list[str] = []
     deleted: list[str] = []
@@ -204,7 +301,11 @@ def sync_skills(
         destination.parent.mkdir(parents=True, exist_ok=True)
         shutil.copy2(source_file, destination)
 
-    stale_paths = sorted(set(target_files) - set(source_files))
+    stale_paths = sorted(
+        relative_path
+        for relative_path in set(target_files) - set(source_files)
+        if not is_manifest_excluded(relative_path, manifests)
+    )
     for relative_path in stale_paths:
         stale_path = target / relative_path
         deleted.append(relative_path.as_posix())
@@ -354,6 +455,8 @@ def main() -> int:
         "skills_sync": skills_summary,
         "agent_sync": agent_summary,
     }
+    if args.size_report:
+        summary["size_report"] = build_size_report(skills_source)
     print(json.dumps(summary, ensure_ascii=True, indent=2))
     return 0
 
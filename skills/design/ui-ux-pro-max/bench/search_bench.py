@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Search quality and latency benchmark for core.search / search_stack / detect_domain.
+Usage: python bench/search_bench.py [--k 5] [--runs 20] [--queries bench/queries.json]
+
+Runs offline against the bundled CSVs and the labeled queries in
+bench/queries.json (every domain and stack), and reports, as JSON:
+  - quality: recall@k and MRR@k, overall and per domain/stack, plus
+    detect_domain accuracy
+  - latency p50/p95/p99 (ms) for
+      cold    index not loaded yet (compiled corpus opened on the call)
+      warm    index loaded, result cache empty (pure ranking + decoding)
+      cached  result cache hit
+      detect  detect_domain alone
+  - peak RSS of the benchmark process
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+
+import core  # noqa: E402
+from stats import percentile  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _summary(samples):
+    return {
+        "p50": round(percentile(samples, 50), 3),
+        "p95": round(percentile(samples, 95), 3),
+        "p99": round(percentile(samples, 99), 3),
+        "n": len(samples),
+    }
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KiB elsewhere
+
+
+def _run(entry, k):
+    if "stack" in entry:
+        return core.search_stack(entry["query"], entry["stack"], k)
+    return core.search(entry["query"], entry["domain"], k)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _reset(index=False):
+    core.cache_clear(indexes=index)
+
+
+def evaluate_quality(entries, key_columns, k):
+    """recall@k and MRR@k per query, aggregated overall and per group"""
+    groups = {}
+    for entry in entries:
+        group = f"stack:{entry['stack']}" if "stack" in entry else entry["domain"]
+        key = key_columns["stack" if "stack" in entry else entry["domain"]]
+        ranked = [row.get(key) for row in _run(entry, k).get("results", [])]
+        relevant = set(entry["relevant"])
+        hits = [i for i, value in enumerate(ranked) if value in relevant]
+        groups.setdefault(group, []).append({
+            "recall": len({ranked[i] for i in hits}) / len(relevant),
+            "rr": 1 / (hits[0] + 1) if hits else 0.0,
+        })
+
+    def mean(rows, name):
+        return round(sum(row[name] for row in rows) / len(rows), 4)
+
+    everything = [row for rows in groups.values() for row in rows]
+    return {
+        f"recall@{k}": mean(everything, "recall"),
+        f"mrr@{k}": mean(everything, "rr"),
+        "queries": len(everything),
+        "by_group": {group: {f"recall@{k}": mean(rows, "recall"), f"mrr@{k}": mean(rows, "rr"), "queries": len(rows)}
+                     for group, rows in sorted(groups.items())},
+    }
+
+
+def evaluate_detect(cases):
+    misses = [{"query": case["query"], "expected": case["domain"], "got": got}
+              for case in cases
+              if (got := core.detect_domain(case["query"])) != case["domain"]]
+    return {"accuracy": round(1 - len(misses) / len(cases), 4) if cases else None, "misses": misses}
+
+
+def measure_latency(entries, detect_cases, k, runs):
+    """Per-call latency samples (ms) for the cold, warm, cached and detect paths"""
+    cold, warm, cached, detect = [], [], [], []
+    for _ in range(runs):
+        for entry in entries:
+            _reset(index=True)
+            cold.append(_timed(lambda: _run(entry, k))[1])
+            _reset()
+            warm.append(_timed(lambda: _run(entry, k))[1])
+            cached.append(_timed(lambda: _run(entry, k))[1])
+        for case in detect_cases:
+            detect.append(_timed(lambda: core.detect_domain(case["query"]))[1])
+    return {"cold": _summary(cold), "warm": _summary(warm), "cached": _summary(cached), "detect": _summary(detect)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="core search quality and latency benchmark")
+    parser.add_argument("--queries", default=str(BENCH_DIR / "queries.json"), help="Labeled query set (JSON)")
+    parser.add_argument("--k", type=int, default=5, help="Cut-off for recall@k / MRR@k (default: 5)")
+    parser.add_argument("--runs", type=int, default=20, help="Timing passes over the query set (default: 20)")
+    args = parser.parse_args()
+
+    labeled = json.loads(Path(args.queries).read_text(encoding="utf-8"))
+    entries = labeled["queries"]
+    detect_cases = labeled.get("detect", [])
+
+    # Compile any missing corpus files up front so "cold" measures loading, not building
+    _, first_ms = _timed(lambda: [_run(entry, args.k) for entry in entries])
+    _reset(index=True)
+
+    report = {
+        "python": sys.version.split()[0],
+        "k": args.k,
+        "runs": args.runs,
+        "first_pass_ms": round(first_ms, 2),
+        "quality": evaluate_quality(entries, labeled["key_columns"], args.k),
+        "detect_domain": evaluate_detect(detect_cases),
+        "latency_ms": measure_latency(entries, detect_cases, args.k, args.runs),
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Startup benchmark for the search.py CLI.
+Usage: python bench/startup.py [--runs 10] [--scenario domain]
+
+Runs each CLI scenario in fresh interpreters and reports, as JSON:
+  - wall-clock p50/p95/min over all runs
+  - import time (-X importtime) of every module the CLI pulls in beyond
+    a bare `python -c pass`, slowest first
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from stats import percentile
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+SEARCH = str(SCRIPTS_DIR / "search.py")
+
+SCENARIOS = {
+    "domain": [SEARCH, "blue palette", "-d", "color"],
+    "auto": [SEARCH, "glassmorphism dark mode"],
+    "stack": [SEARCH, "list performance", "-s", "react-native"],
+    "json": [SEARCH, "fintech", "-d", "product", "--json"],
+    "design-system": [SEARCH, "SaaS dashboard", "--design-system"],
+}
+
+
+def _import_times(argv):
+    """Run argv under -X importtime and return {module: (self_us, cumulative_us)}"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *argv],
+                          capture_output=True, text=True, cwd=str(SCRIPTS_DIR))
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative))
+    return modules
+
+
+def run_scenario(argv, runs):
+    """Time a CLI invocation over fresh interpreters."""
+    walls = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *argv], stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, cwd=str(SCRIPTS_DIR), check=True)
+        walls.append((time.perf_counter() - start) * 1000)
+
+    baseline = _import_times(["-c", "pass"])
+    imports = _import_times(argv)
+    extra = {name: t for name, t in imports.items() if name not in baseline}
+    slowest = sorted(extra.items(), key=lambda kv: kv[1][0], reverse=True)[:15]
+
+    return {
+        "wall_ms": {
+            "p50": round(percentile(walls, 50), 2),
+            "p95": round(percentile(walls, 95), 2),
+            "min": round(min(walls), 2),
+        },
+        "imported_modules": len(extra),
+        "import_self_ms_total": round(sum(t[0] for t in extra.values()) / 1000, 2),
+        "slowest_imports_ms": {name: round(t[0] / 1000, 2) for name, t in slowest},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="search.py startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario (default: 10)")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), action="append",
+                        help="Scenario to run (repeatable, default: all)")
+    args = parser.parse_args()
+
+    report = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "scenarios": {name: run_scenario(SCENARIOS[name], args.runs)
+                      for name in (args.scenario or SCENARIOS)},
+    }
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the benchmark scripts in bench/"""
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (0-100) of a non-empty sample"""
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
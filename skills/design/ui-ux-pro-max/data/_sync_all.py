@@ -6,8 +6,18 @@ Sync colors.csv and ui-reasoning.csv with the updated products.csv (161 entries)
 - Add new entries for missing product types
 - Keep colors.csv aligned 1:1 with products.csv
 - Renumber everything
+- Derive new color rows in one batch (NumPy when installed)
+- Re-derive only rows whose inputs changed since the last run (see Sync state)
+- Rewrite a file only when one of its rows changed, and report every touched row
+
+Usage: python _sync_all.py [--dry-run]
 """
-import csv, os, json
+import csv, os, json, hashlib, tempfile, time
+
+try:
+    import numpy as np
+except ImportError:  # derive_rows falls back to derive_row per row
+    np = None
 
 BASE = os.path.dirname(os.path.abspath(__file__))
 
@@ -56,6 +66,220 @@ def derive_row(pt, pri, sec, acc, bg, notes=""):
     ring = pri
     return [pt, pri, on_pri, sec, on_sec, acc, on_acc, bg, fg, card, card_fg, muted, muted_fg, border, destr, on_destr, ring, notes]
 
+# ─── Batch color engine ──────────────────────────────────────────────────────
+# derive_rows() turns all palettes into (N, 3) RGB arrays and computes
+# luminance, light/dark and blends for every row at once. Rows are identical
+# to derive_row's; without NumPy it simply calls derive_row per palette.
+_HEX_BYTE = [f"{i:02X}" for i in range(256)]
+
+def _rgb_array(hexes):
+    packed = np.array([int(h.lstrip("#"), 16) for h in hexes], dtype=np.int64)
+    return np.stack([(packed >> 16) & 255, (packed >> 8) & 255, packed & 255], axis=1)
+
+def _lum_array(rgb):
+    c = rgb / 255.0
+    c = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return 0.2126*c[:, 0] + 0.7152*c[:, 1] + 0.0722*c[:, 2]
+
+def _hex_list(rgb):
+    """Same rounding as r2h: truncate, then clamp to 0..255."""
+    rgb = np.clip(np.trunc(rgb), 0, 255).astype(np.int64)
+    return ["#" + _HEX_BYTE[r] + _HEX_BYTE[g] + _HEX_BYTE[b] for r, g, b in rgb.tolist()]
+
+def _on_list(rgb):
+    return ["#FFFFFF" if light_text else "#0F172A" for light_text in (_lum_array(rgb) < 0.4).tolist()]
+
+def derive_rows(palettes):
+    """derive_row for many (pt, pri, sec, acc, bg[, notes]) palettes at once."""
+    palettes = [tuple(p) + ("",) * (6 - len(p)) for p in palettes]
+    if np is None or not palettes:
+        return [derive_row(*p) for p in palettes]
+
+    pts, pris, secs, accs, bgs, notes = zip(*palettes)
+    pri, sec, acc, bg = (_rgb_array(c) for c in (pris, secs, accs, bgs))
+    dark = _lum_array(bg) < 0.18
+    dark_col = dark[:, None]
+    white = np.full_like(bg, 255)
+
+    card = _hex_list(np.where(dark_col, bg + 10, white))
+    muted_base = np.where(dark_col, bg, white)
+    muted = _hex_list(muted_base + (pri - muted_base) * np.where(dark_col, 0.08, 0.06))
+    border = _hex_list(white + (pri - white) * 0.12)
+    on_pri, on_sec, on_acc = _on_list(pri), _on_list(sec), _on_list(acc)
+
+    rows = []
+    for i, is_dark_bg in enumerate(dark.tolist()):
+        fg = "#FFFFFF" if is_dark_bg else "#0F172A"
+        rows.append([pts[i], pris[i], on_pri[i], secs[i], on_sec[i], accs[i], on_acc[i], bgs[i], fg,
+                     card[i], fg, muted[i], "#94A3B8" if is_dark_bg else "#64748B",
+                     "rgba(255,255,255,0.08)" if is_dark_bg else border[i],
+                     "#DC2626", "#FFFFFF", pris[i], notes[i]])
+    return rows
+
+# ─── CSV output ──────────────────────────────────────────────────────────────
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+def atomic_write(path, write):
+    """Write through a temp file in the same directory, then os.replace."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def write_if_changed(path, headers, rows, original, key, dry_run=False):
+    """Rewrite path only if rows differ from the rows read from it.
+
+    Returns (changed, written): the keys of the rows that are new or whose
+    values changed, and whether the file was (or, with dry_run, would be)
+    rewritten.
+    """
+    def values(row):
+        return [row.get(h) for h in headers]
+
+    before = {row.get(key): values(row) for row in original}
+    changed = [row[key] for row in rows if before.get(row[key]) != values(row)]
+    if [values(row) for row in rows] == [values(row) for row in original]:
+        return changed, False
+    if not dry_run:
+        def write(f):
+            writer = csv.DictWriter(f, fieldnames=headers)
+            writer.writeheader()
+            writer.writerows(rows)
+        atomic_write(path, write)
+    return changed, True
+
+def _listed(marker, keys, note=""):
+    for key in keys[:20]:
+        print(f"       {marker} {key}{note}")
+    if len(keys) > 20:
+        print(f"       … {len(keys) - 20} more")
+
+def report_touched(name, touched, written, dry_run=False):
+    """Print exactly which rows of one file a run added, re-derived, renamed or removed."""
+    if written:
+        verb = "would be rewritten" if dry_run else "rewritten"
+        counts = ", ".join(f"{len(touched[k])} {k}" for k in ("added", "re-derived", "renamed", "removed"))
+        print(f"     Touched: {counts}, {touched['renumbered']} renumbered — {name} {verb}")
+        _listed("+", touched["added"])
+        _listed("~", touched["re-derived"])
+        _listed("→", touched["renamed"])
+        _listed("-", touched["removed"])
+    else:
+        print(f"     Unchanged, {name} not rewritten")
+    if touched["review"]:
+        print(f"     Review: {len(touched['review'])} rows kept although what they describe changed (maintained by hand)")
+        _listed("?", touched["review"])
+
+# ─── Sync state ──────────────────────────────────────────────────────────────
+# _compiled/sync-state.json remembers a hash of every products.csv row and,
+# for each row this script derived, hashes of its inputs (palette or product
+# row) and of the row it wrote. A derived row is derived again when its inputs
+# change, unless it was edited by hand since (its hash no longer matches):
+# hand-maintained rows are only renamed, renumbered or removed, never rewritten.
+STATE_FILE = os.path.join(BASE, "_compiled", "sync-state.json")
+STATE_VERSION = 1
+
+def _hash(value):
+    return hashlib.sha1(json.dumps(value, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+def row_hash(row, headers):
+    """Hash of a CSV row without its No column: renumbering is not an edit."""
+    return _hash([row.get(h) for h in headers if h != "No"])
+
+def load_state():
+    try:
+        with open(STATE_FILE, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") == STATE_VERSION:
+            return state
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"version": STATE_VERSION, "products": {}, "colors": {}, "ui-reasoning": {}}
+
+def save_state(state):
+    atomic_write(STATE_FILE, lambda f: json.dump(state, f, ensure_ascii=False, indent=1, sort_keys=True))
+
+def read_products():
+    """products.csv rows (read once per run) and a hash of each, by Product Type."""
+    headers, products = read_csv(os.path.join(BASE, "products.csv"))
+    return products, {prod["Product Type"]: row_hash(prod, headers) for prod in products}
+
+def sync_rows(tag, name, key, products, renames, inputs_for, derive_many, derived, changed_products, dry_run):
+    """Align one derived CSV with products.csv, deriving only what is new or stale.
+
+    inputs_for(prod) -> what a derived row depends on; derive_many(prods,
+    headers) -> derived rows (No left blank) in the same order. `derived` is
+    this file's section of the sync state and is updated in place. Kept rows
+    whose product is in changed_products are listed for review.
+    Returns (rows, touched, written).
+    """
+    src = os.path.join(BASE, name)
+    headers, existing = read_csv(src)
+    original = [dict(row) for row in existing]
+
+    # Lookup by product type, after removals and renames
+    current = {}
+    renamed = []
+    for row in existing:
+        pt = row.get(key, "").strip()
+        if not pt:
+            continue
+        if pt in REMOVE_TYPES:
+            print(f"  [{tag}] REMOVE: {pt}")
+            continue
+        if pt in renames:
+            new_name = renames[pt]
+            print(f"  [{tag}] RENAME: {pt} → {new_name}")
+            row[key] = new_name
+            pt = new_name
+            renamed.append(pt)
+        current[pt] = row
+
+    touched = {"added": [], "re-derived": [], "renamed": [], "removed": [], "review": []}
+    final_rows = []
+    pending = []  # (position in final_rows, product)
+    inputs = {}
+    for i, prod in enumerate(products, 1):
+        pt = prod["Product Type"]
+        inputs[pt] = _hash(inputs_for(prod))
+        row = current.get(pt)
+        record = derived.get(pt)
+        stale = record is not None and record["inputs"] != inputs[pt]
+        if row is not None and record is not None and record["output"] != row_hash(row, headers):
+            del derived[pt]  # edited by hand since it was derived: the editor owns it now
+            record = None
+        if row is None or (record is not None and stale):
+            touched["added" if row is None else "re-derived"].append(pt)
+            pending.append((len(final_rows), prod))
+            final_rows.append(None)
+            continue
+        if stale or (record is None and pt in changed_products):
+            touched["review"].append(pt)
+        row["No"] = str(i)
+        final_rows.append(row)
+
+    for (pos, prod), new_row in zip(pending, derive_many([prod for _, prod in pending], headers)):
+        new_row["No"] = str(pos + 1)
+        final_rows[pos] = new_row
+        derived[prod["Product Type"]] = {"inputs": inputs[prod["Product Type"]], "output": row_hash(new_row, headers)}
+    for pt in [pt for pt in derived if pt not in inputs]:
+        del derived[pt]
+
+    touched["removed"] = [pt for pt in current if pt not in inputs]
+    changed, written = write_if_changed(src, headers, final_rows, original, key, dry_run)
+    rebuilt = set(touched["added"]) | set(touched["re-derived"])
+    touched["renamed"] = [pt for pt in renamed if pt in inputs]
+    touched["renumbered"] = sum(1 for pt in changed if pt not in rebuilt and pt not in renamed)
+    return final_rows, touched, written
+
 # ─── Rename maps ─────────────────────────────────────────────────────────────
 COLOR_RENAMES = {
     "Quantum Computing": "Quantum Computing Interface",
@@ -185,66 +409,30 @@ NEW_COLORS = {
 }
 
 # ─── 1. REBUILD colors.csv ───────────────────────────────────────────────────
-def rebuild_colors():
-    src = os.path.join(BASE, "colors.csv")
-    with open(src, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames
-        existing = list(reader)
+DEFAULT_PALETTE = ("#2563EB", "#3B82F6", "#059669", "#F8FAFC", "Auto-generated default")
 
-    # Build lookup: Product Type -> row data
-    color_map = {}
-    for row in existing:
-        pt = row.get("Product Type", "").strip()
-        if not pt:
-            continue
-        # Remove deleted types
-        if pt in REMOVE_TYPES:
-            print(f"  [colors] REMOVE: {pt}")
-            continue
-        # Rename mismatched types
-        if pt in COLOR_RENAMES:
-            new_name = COLOR_RENAMES[pt]
-            print(f"  [colors] RENAME: {pt} → {new_name}")
-            row["Product Type"] = new_name
-            pt = new_name
-        color_map[pt] = row
+def palette_for(prod):
+    return NEW_COLORS.get(prod["Product Type"], DEFAULT_PALETTE)
 
-    # Read products.csv to get the correct order
-    with open(os.path.join(BASE, "products.csv"), newline="", encoding="utf-8") as f:
-        products = list(csv.DictReader(f))
+def rebuild_colors(products, state, dry_run=False):
+    timing = {}
 
-    # Build final rows in products.csv order
-    final_rows = []
-    added = 0
-    for i, prod in enumerate(products, 1):
-        pt = prod["Product Type"]
-        if pt in color_map:
-            row = color_map[pt]
-            row["No"] = str(i)
-            final_rows.append(row)
-        elif pt in NEW_COLORS:
-            pri, sec, acc, bg, notes = NEW_COLORS[pt]
-            new_row = derive_row(pt, pri, sec, acc, bg, notes)
-            d = dict(zip(headers, [str(i)] + new_row))
-            final_rows.append(d)
-            added += 1
-        else:
-            print(f"  [colors] WARNING: No color data for '{pt}' - using defaults")
-            new_row = derive_row(pt, "#2563EB", "#3B82F6", "#059669", "#F8FAFC", "Auto-generated default")
-            d = dict(zip(headers, [str(i)] + new_row))
-            final_rows.append(d)
-            added += 1
-
-    # Write
-    with open(src, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        writer.writerows(final_rows)
-
-    product_count = len(products)
-    print(f"\n  ✅ colors.csv: {len(final_rows)} rows ({product_count} products)")
-    print(f"     Added: {added} new color rows")
+    def derive_many(prods, headers):
+        started = time.perf_counter()
+        for prod in prods:
+            if prod["Product Type"] not in NEW_COLORS:
+                print(f"  [colors] WARNING: No color data for '{prod['Product Type']}' - using defaults")
+        rows = derive_rows([(prod["Product Type"],) + palette_for(prod) for prod in prods])
+        timing["ms"] = (time.perf_counter() - started) * 1000
+        return [dict(zip(headers, [""] + row)) for row in rows]
+
+    rows, touched, written = sync_rows("colors", "colors.csv", "Product Type", products, COLOR_RENAMES,
+                                       palette_for, derive_many, state["colors"], set(), dry_run)
+
+    derived = len(touched["added"]) + len(touched["re-derived"])
+    print(f"\n  ✅ colors.csv: {len(rows)} rows ({len(products)} products)")
+    print(f"     Derived: {derived} color rows ({'NumPy' if np is not None else 'pure Python'}, {timing.get('ms', 0):.1f} ms)")
+    report_touched("colors.csv", touched, written, dry_run)
 
 # ─── 2. REBUILD ui-reasoning.csv ─────────────────────────────────────────────
 def derive_ui_reasoning(prod):
@@ -356,59 +544,43 @@ def derive_ui_reasoning(prod):
     }
 
 
-def rebuild_ui_reasoning():
-    src = os.path.join(BASE, "ui-reasoning.csv")
-    with open(src, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames
-        existing = list(reader)
-
-    # Build lookup
-    ui_map = {}
-    for row in existing:
-        cat = row.get("UI_Category", "").strip()
-        if not cat:
-            continue
-        if cat in REMOVE_TYPES:
-            print(f"  [ui-reason] REMOVE: {cat}")
-            continue
-        if cat in UI_RENAMES:
-            new_name = UI_RENAMES[cat]
-            print(f"  [ui-reason] RENAME: {cat} → {new_name}")
-            row["UI_Category"] = new_name
-            cat = new_name
-        ui_map[cat] = row
-
-    with open(os.path.join(BASE, "products.csv"), newline="", encoding="utf-8") as f:
-        products = list(csv.DictReader(f))
-
-    final_rows = []
-    added = 0
-    for i, prod in enumerate(products, 1):
-        pt = prod["Product Type"]
-        if pt in ui_map:
-            row = ui_map[pt]
-            row["No"] = str(i)
-            final_rows.append(row)
-        else:
-            row = derive_ui_reasoning(prod)
-            row["No"] = str(i)
-            final_rows.append(row)
-            added += 1
-
-    with open(src, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        writer.writerows(final_rows)
+def rebuild_ui_reasoning(products, state, changed_products, dry_run=False):
+    rows, touched, written = sync_rows("ui-reason", "ui-reasoning.csv", "UI_Category", products, UI_RENAMES,
+                                       lambda prod: {k: v for k, v in prod.items() if k != "No"},
+                                       lambda prods, _: [derive_ui_reasoning(p) for p in prods],
+                                       state["ui-reasoning"], changed_products, dry_run)
 
-    print(f"\n  ✅ ui-reasoning.csv: {len(final_rows)} rows")
-    print(f"     Added: {added} new reasoning rows")
+    derived = len(touched["added"]) + len(touched["re-derived"])
+    print(f"\n  ✅ ui-reasoning.csv: {len(rows)} rows")
+    print(f"     Derived: {derived} reasoning rows")
+    report_touched("ui-reasoning.csv", touched, written, dry_run)
 
 
 # ─── MAIN ────────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Sync colors.csv and ui-reasoning.csv with products.csv")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be touched without writing")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    products, product_hashes = read_products()
+    state = load_state()
+    previous = state["products"]
+    changed_products = {pt for pt, h in product_hashes.items() if previous.get(pt, h) != h}
+    if previous:
+        new = [pt for pt in product_hashes if pt not in previous]
+        gone = [pt for pt in previous if pt not in product_hashes]
+        print(f"products.csv: {len(products)} rows; since last sync {len(changed_products)} changed, "
+              f"{len(new)} added, {len(gone)} removed\n")
+
     print("=== Rebuilding colors.csv ===")
-    rebuild_colors()
+    rebuild_colors(products, state, args.dry_run)
     print("\n=== Rebuilding ui-reasoning.csv ===")
-    rebuild_ui_reasoning()
-    print("\n🎉 Done!")
+    rebuild_ui_reasoning(products, state, changed_products, args.dry_run)
+
+    state["products"] = product_hashes
+    if not args.dry_run:
+        save_state(state)
+    print(f"\n🎉 Done! ({(time.perf_counter() - started) * 1000:.0f} ms{', dry run' if args.dry_run else ''})")
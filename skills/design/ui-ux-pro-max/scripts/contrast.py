@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Contrast - WCAG contrast checks for every colors.csv palette
+Usage: python contrast.py [--failing] [-o report.json]
+
+Each palette is checked for the foreground/background token pairs in PAIRS:
+4.5:1 for text, 3:1 for UI elements (accent, primary and focus ring on the
+page background). One pass computes the luminance of every distinct color
+once, then the ratios of all pairs of all rows (as NumPy arrays when NumPy
+is installed, else per row). NumPy is imported by the first check_palettes
+call, not with this module, so single-palette checks never pay for it.
+
+Results are cached per row in data/_compiled/contrast.json, keyed by a hash
+of the row's token values, so a re-run only recomputes edited rows, and
+ContrastIndex.check() answers for a palette with one dict lookup once its
+row is in the cache (read on first use) or has been seen. The cache is
+dropped when PAIRS or the format change.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+from core import COMPILED_DIR, DATA_DIR
+
+COLORS_FILE = "colors.csv"
+CACHE_FILE = "contrast.json"
+CACHE_VERSION = 1
+
+# (foreground token, background token, minimum ratio)
+PAIRS = [
+    ("Foreground", "Background", 4.5),
+    ("Muted Foreground", "Background", 4.5),
+    ("Card Foreground", "Card", 4.5),
+    ("Muted Foreground", "Muted", 4.5),
+    ("On Primary", "Primary", 4.5),
+    ("On Secondary", "Secondary", 4.5),
+    ("On Accent", "Accent", 4.5),
+    ("On Destructive", "Destructive", 4.5),
+    ("Primary", "Background", 3.0),
+    ("Accent", "Background", 3.0),
+    ("Ring", "Background", 3.0),
+]
+TOKENS = sorted({token for fg, bg, _ in PAIRS for token in (fg, bg)})
+
+# Text colors derive_row (data/_sync_all.py) picks from for On * tokens
+ON_CANDIDATES = ("#FFFFFF", "#0F172A")
+
+_HEX = re.compile(r"#[0-9A-Fa-f]{6}")
+
+
+# ============ WCAG ============
+def relative_luminance(hex_color):
+    """WCAG 2.x relative luminance of a #RRGGBB color"""
+    value = int(hex_color[1:], 16)
+    channels = [((value >> shift) & 255) / 255 for shift in (16, 8, 0)]
+    r, g, b = [c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4 for c in channels]
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def contrast_ratio(a, b, luminance=None):
+    """Contrast ratio (1-21) between two #RRGGBB colors"""
+    la = luminance[a] if luminance else relative_luminance(a)
+    lb = luminance[b] if luminance else relative_luminance(b)
+    if la < lb:
+        la, lb = lb, la
+    return (la + 0.05) / (lb + 0.05)
+
+
+def _is_hex(value):
+    return bool(value) and _HEX.fullmatch(value) is not None
+
+
+def row_key(tokens):
+    """Hash of a palette's PAIRS token values; equal palettes share results"""
+    joined = "\x1f".join(tokens.get(token) or "" for token in TOKENS)
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:16]
+
+
+def check_palette(tokens, luminance=None):
+    """Check one palette (a colors.csv row or any dict with the PAIRS tokens).
+
+    Pairs with a missing or non-hex value (e.g. an rgba border) are skipped.
+    A failing On * token gets the better of ON_CANDIDATES as "suggest" when
+    that one passes.
+    """
+    if luminance is None:
+        luminance = {c: relative_luminance(c) for c in (tokens.get(t) for t in TOKENS) if _is_hex(c)}
+    ratios = []
+    for fg, bg, _ in PAIRS:
+        a, b = tokens.get(fg), tokens.get(bg)
+        ratios.append(contrast_ratio(a, b, luminance) if _is_hex(a) and _is_hex(b) else None)
+    return _result(tokens, ratios)
+
+
+def _result(tokens, ratios):
+    """check_palette result from the ratio of each PAIRS pair (None: skipped)"""
+    pairs = []
+    for (fg, bg, minimum), ratio in zip(PAIRS, ratios):
+        if ratio is None:
+            continue
+        b = tokens.get(bg)
+        pair = {"fg": fg, "bg": bg, "ratio": round(ratio, 2), "min": minimum, "pass": ratio >= minimum}
+        if not pair["pass"] and fg.startswith("On "):
+            best = max(ON_CANDIDATES, key=lambda c: contrast_ratio(c, b))
+            if contrast_ratio(best, b) >= minimum:
+                pair["suggest"] = best
+        pairs.append(pair)
+    return {"pairs": pairs, "failing": sum(not p["pass"] for p in pairs)}
+
+
+def failures(result):
+    """The failing pairs of a check_palette result"""
+    return [pair for pair in result["pairs"] if not pair["pass"]]
+
+
+def _numpy():
+    """The numpy module, or None when it is not installed"""
+    try:
+        import numpy
+    except ImportError:  # check_palettes falls back to check_palette per row
+        return None
+    return numpy
+
+
+def check_palettes(rows):
+    """check_palette for many rows: luminance once per distinct color, ratios as arrays"""
+    np = _numpy() if rows else None
+    if np is None:
+        colors = {row.get(t) for row in rows for t in TOKENS}
+        luminance = {c: relative_luminance(c) for c in colors if _is_hex(c)}
+        return [check_palette(row, luminance) for row in rows]
+
+    colors = sorted({c for row in rows for c in (row.get(t) for t in TOKENS) if _is_hex(c)})
+    index = {c: i for i, c in enumerate(colors)}
+    packed = np.array([int(c[1:], 16) for c in colors] or [0], dtype=np.int64)
+    channels = np.stack([(packed >> 16) & 255, (packed >> 8) & 255, packed & 255], axis=1) / 255
+    linear = np.where(channels <= 0.03928, channels / 12.92, ((channels + 0.055) / 1.055) ** 2.4)
+    luminance = 0.2126 * linear[:, 0] + 0.7152 * linear[:, 1] + 0.0722 * linear[:, 2]
+
+    columns = []  # per pair: the ratio of every row, None where skipped
+    for fg, bg, _ in PAIRS:
+        ids = [(index.get(row.get(fg), -1), index.get(row.get(bg), -1)) for row in rows]
+        a, b = np.array(ids, dtype=np.int64).T
+        la, lb = luminance[a], luminance[b]
+        ratio = (np.maximum(la, lb) + 0.05) / (np.minimum(la, lb) + 0.05)
+        columns.append([r if i >= 0 and j >= 0 else None for r, (i, j) in zip(ratio.tolist(), ids)])
+    return [_result(row, ratios) for row, ratios in zip(rows, zip(*columns))]
+
+
+# ============ INDEX ============
+class ContrastIndex:
+    """check_palette results by row hash, persisted in data/_compiled/contrast.json"""
+
+    def __init__(self, path=None):
+        self.path = path or COMPILED_DIR / CACHE_FILE
+        self._results = {}  # row key -> check_palette result
+        self._cached = None  # rows of the cache file; None until read
+
+    @staticmethod
+    def signature():
+        return [CACHE_VERSION, PAIRS, list(ON_CANDIDATES)]
+
+    def check(self, tokens):
+        """Result for one palette; computed once per distinct set of token values"""
+        if self._cached is None:
+            self._load()
+        key = row_key(tokens)
+        result = self._results.get(key)
+        if result is None:
+            result = self._results[key] = check_palette(tokens)
+        return result
+
+    def validate(self, rows):
+        """Check every row in one pass, reusing cached results.
+
+        Returns (keys, results, computed): the row keys, the result per key
+        and how many rows were not in the cache (duplicates of a computed
+        palette are computed once).
+        """
+        self._load()
+        keys = [row_key(row) for row in rows]
+        pending = {key: row for key, row in zip(keys, rows) if key not in self._results}
+        self._results.update(zip(pending, check_palettes(list(pending.values()))))
+        results = {key: self._results[key] for key in keys}
+        if pending or len(self._cached) != len(results):
+            self._save(results)
+        return keys, results, sum(1 for key in keys if key in pending)
+
+    def _load(self):
+        self._cached = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("signature") == json.loads(json.dumps(self.signature())):
+                self._cached = data["rows"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        for key, result in self._cached.items():
+            self._results.setdefault(key, result)
+
+    def _save(self, results):
+        """Keep only the current rows; an unwritable data dir keeps results in memory"""
+        data = json.dumps({"signature": self.signature(), "rows": results}, ensure_ascii=False)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            pass
+        self._cached = results
+
+
+_default_index = None
+
+
+def default_index():
+    """Process-wide ContrastIndex used by the design system generator"""
+    global _default_index
+    if _default_index is None:
+        _default_index = ContrastIndex()
+    return _default_index
+
+
+# ============ REPORT ============
+def load_palettes(path=None):
+    with open(path or DATA_DIR / COLORS_FILE, "r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def build_report(rows, index=None, failing_only=False):
+    """JSON-ready contrast report for colors.csv rows"""
+    index = index or default_index()
+    keys, results, computed = index.validate(rows)
+    by_pair = {}
+    report_rows = []
+    for row, key in zip(rows, keys):
+        result = results[key]
+        failing = failures(result)
+        for pair in failing:
+            name = f"{pair['fg']} / {pair['bg']}"
+            by_pair[name] = by_pair.get(name, 0) + 1
+        if failing_only and not failing:
+            continue
+        report_rows.append({
+            "no": row.get("No", ""),
+            "product_type": row.get("Product Type", ""),
+            "key": key,
+            "failing": len(failing),
+            "pairs": failing if failing_only else result["pairs"],
+        })
+    return {
+        "source": COLORS_FILE,
+        "pairs": [{"fg": fg, "bg": bg, "min": minimum} for fg, bg, minimum in PAIRS],
+        "palettes": len(rows),
+        "failing_palettes": sum(1 for key in keys if results[key]["failing"]),
+        "failing_by_pair": dict(sorted(by_pair.items(), key=lambda item: -item[1])),
+        "computed": computed,
+        "cached": len(rows) - computed,
+        "rows": report_rows,
+    }
+
+
+# ============ CLI ============
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="WCAG contrast report for colors.csv")
+    parser.add_argument("--colors", default=None, help=f"Palette CSV (default: data/{COLORS_FILE})")
+    parser.add_argument("--failing", action="store_true", help="List only failing palettes and pairs")
+    parser.add_argument("--output", "-o", default=None, help="Write the JSON report to a file")
+    args = parser.parse_args()
+
+    report = build_report(load_palettes(args.colors), failing_only=args.failing)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"{report['failing_palettes']}/{report['palettes']} palettes below WCAG minimums "
+              f"({report['computed']} checked, {report['cached']} cached) -> {args.output}")
+    else:
+        print(text)
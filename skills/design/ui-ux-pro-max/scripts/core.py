@@ -4,71 +4,94 @@
 UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
-import csv
+import heapq
 import re
+import string
+import threading
+from bisect import bisect_left
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+
+import corpus
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
+COMPILED_DIR = DATA_DIR / "_compiled"
 MAX_RESULTS = 3
 
+# Per domain: "search_cols" are indexed, "output_cols" returned. Optional:
+# "field_weights" {column: weight} for BM25F (unlisted columns weigh 1.0),
+# "k1" / "b" to override the BM25 defaults, "fuzzy" for typo/prefix expansion.
 CSV_CONFIG = {
     "style": {
         "file": "styles.csv",
         "search_cols": ["Style Category", "Keywords", "Best For", "Type", "AI Prompt Keywords"],
-        "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Light Mode ✓", "Dark Mode ✓", "Performance", "Accessibility", "Framework Compatibility", "Complexity", "AI Prompt Keywords", "CSS/Technical Keywords", "Implementation Checklist", "Design System Variables"]
+        "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Light Mode ✓", "Dark Mode ✓", "Performance", "Accessibility", "Framework Compatibility", "Complexity", "AI Prompt Keywords", "CSS/Technical Keywords", "Implementation Checklist", "Design System Variables"],
+        "field_weights": {"Style Category": 3}
     },
     "color": {
         "file": "colors.csv",
         "search_cols": ["Product Type", "Notes"],
-        "output_cols": ["Product Type", "Primary", "On Primary", "Secondary", "On Secondary", "Accent", "On Accent", "Background", "Foreground", "Card", "Card Foreground", "Muted", "Muted Foreground", "Border", "Destructive", "On Destructive", "Ring", "Notes"]
+        "output_cols": ["Product Type", "Primary", "On Primary", "Secondary", "On Secondary", "Accent", "On Accent", "Background", "Foreground", "Card", "Card Foreground", "Muted", "Muted Foreground", "Border", "Destructive", "On Destructive", "Ring", "Notes"],
+        "field_weights": {"Product Type": 3}
     },
     "chart": {
         "file": "charts.csv",
         "search_cols": ["Data Type", "Keywords", "Best Chart Type", "When to Use", "When NOT to Use", "Accessibility Notes"],
-        "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "When to Use", "When NOT to Use", "Data Volume Threshold", "Color Guidance", "Accessibility Grade", "Accessibility Notes", "A11y Fallback", "Library Recommendation", "Interactive Level"]
+        "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "When to Use", "When NOT to Use", "Data Volume Threshold", "Color Guidance", "Accessibility Grade", "Accessibility Notes", "A11y Fallback", "Library Recommendation", "Interactive Level"],
+        "field_weights": {"Data Type": 3}
     },
     "landing": {
         "file": "landing.csv",
         "search_cols": ["Pattern Name", "Keywords", "Conversion Optimization", "Section Order"],
-        "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"]
+        "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"],
+        "field_weights": {"Pattern Name": 3}
     },
     "product": {
         "file": "products.csv",
         "search_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Key Considerations"],
-        "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"]
+        "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"],
+        "field_weights": {"Product Type": 3}
     },
     "ux": {
         "file": "ux-guidelines.csv",
         "search_cols": ["Category", "Issue", "Description", "Platform"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"],
+        "field_weights": {"Issue": 3}
     },
     "typography": {
         "file": "typography.csv",
         "search_cols": ["Font Pairing Name", "Category", "Mood/Style Keywords", "Best For", "Heading Font", "Body Font"],
-        "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"]
+        "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"],
+        "field_weights": {"Font Pairing Name": 3}
     },
     "icons": {
         "file": "icons.csv",
         "search_cols": ["Category", "Icon Name", "Keywords", "Best For"],
-        "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"]
+        "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"],
+        "field_weights": {"Icon Name": 3},
+        "fuzzy": True
     },
     "react": {
         "file": "react-performance.csv",
         "search_cols": ["Category", "Issue", "Keywords", "Description"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"],
+        "field_weights": {"Issue": 3}
     },
     "web": {
         "file": "app-interface.csv",
         "search_cols": ["Category", "Issue", "Keywords", "Description"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"],
+        "field_weights": {"Issue": 3}
     },
     "google-fonts": {
         "file": "google-fonts.csv",
         "search_cols": ["Family", "Category", "Stroke", "Classifications", "Keywords", "Subsets", "Designers"],
-        "output_cols": ["Family", "Category", "Stroke", "Classifications", "Styles", "Variable Axes", "Subsets", "Designers", "Popularity Rank", "Google Fonts URL"]
+        "output_cols": ["Family", "Category", "Stroke", "Classifications", "Styles", "Variable Axes", "Subsets", "Designers", "Popularity Rank", "Google Fonts URL"],
+        "field_weights": {"Family": 3},
+        "fuzzy": True
     }
 }
 
@@ -100,9 +123,59 @@ _STACK_COLS = {
 AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
+# ============ TOKENIZER ============
+# Bump when tokenize() changes so compiled corpora are rebuilt
+TOKENIZER_VERSION = 2
+
+# Domain terms kept despite being shorter than three characters
+SHORT_TERMS = {"ui", "ux", "ai", "ar", "vr", "xr", "ml", "os", "qr", "tv", "js", "ts", "db", "2d", "3d"}
+
+# ASCII punctuation -> space in one C-level pass; other scripts fall back to the regex
+_PUNCT_TABLE = str.maketrans({ch: " " for ch in string.punctuation if ch != "_"})
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    """Light suffix stemmer: S-stemmer plurals (Harman) plus a guarded "-ing" strip"""
+    if word[-1] not in "sg" or len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("ies") and not word.endswith(("eies", "aies")):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes")):
+        return word[:-2]
+    if word.endswith("es") and not word.endswith(("aes", "ees", "oes")):
+        return word[:-1]
+    if word.endswith("s") and not word.endswith(("us", "ss", "is")):
+        return word[:-1]
+    if word.endswith("ing") and len(word) >= 7:
+        word = word[:-3]
+        # running -> run, but keep fill/pass/buzz
+        if word[-1] == word[-2] and word[-1] not in "lsz":
+            word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Lowercase, strip punctuation, split, drop short words (except SHORT_TERMS), stem"""
+    text = str(text).lower().translate(_PUNCT_TABLE)
+    if not text.isascii():
+        text = _NON_WORD_RE.sub(' ', text)
+    return [stem(w) for w in text.split() if len(w) > 2 or w in SHORT_TERMS]
+
+
 # ============ BM25 IMPLEMENTATION ============
+_BOUND_SLACK = 1 + 1e-9
+
+
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search.
+
+    Over a compiled corpus, field_weights turn it into simple BM25F: a term's
+    frequency and a doc's length are both the weighted sums of their
+    per-field counts, then plugged into the usual formula. All-1.0 weights
+    give exactly plain BM25 over the concatenated fields.
+    """
 
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
@@ -113,11 +186,17 @@ class BM25:
         self.idf = {}
         self.doc_freqs = defaultdict(int)
         self.N = 0
+        self._postings = {}
+        self._source = None
+        self._norms = None
+        self._max_scores = {}
+        self._field_weights = None
+        self._weighted = {}
+        self.fuzzy = None
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        """Tokenize with the module tokenizer (documents are tokenized once, at corpus build)"""
+        return tokenize(text)
 
     def fit(self, documents):
         """Build BM25 index from documents"""
@@ -128,92 +207,584 @@ class BM25:
         self.doc_lengths = [len(doc) for doc in self.corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
+        postings = defaultdict(lambda: ([], []))
+        for idx, doc in enumerate(self.corpus):
+            term_freqs = defaultdict(int)
             for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+                term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                self.doc_freqs[word] += 1
+                postings[word][0].append(idx)
+                postings[word][1].append(tf)
+        self._postings = dict(postings)
 
         for word, freq in self.doc_freqs.items():
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
 
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+    def fit_corpus(self, compiled, field_weights=None):
+        """Use the pre-tokenized postings of a compiled corpus (see corpus.py).
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+        field_weights: one weight per search column (BM25F), or None.
+        """
+        self._source = compiled
+        self.N = compiled.N
+        if field_weights is None or all(w == 1 for w in field_weights):
+            self.doc_lengths = compiled.doc_lengths
+            self.avgdl = compiled.avgdl
+            return
+        self._field_weights = tuple(field_weights)
+        # Start from the unweighted lengths and adjust only the re-weighted fields
+        fields, lengths = compiled.fields, compiled.field_lengths
+        doc_lengths = list(compiled.doc_lengths)
+        for f, w in enumerate(self._field_weights):
+            if w != 1:
+                doc_lengths = [dl + (w - 1) * fl for dl, fl in zip(doc_lengths, lengths[f::fields])]
+        self.doc_lengths = doc_lengths
+        self.avgdl = sum(doc_lengths) / self.N if self.N else 0
+
+    def postings(self, term):
+        """Return (doc ids, term freqs) for a term, or None if it never occurs"""
+        if self._field_weights is not None:
+            if term not in self._weighted:
+                self._weighted[term] = self._weighted_postings(term)
+            return self._weighted[term]
+        if self._source is not None:
+            return self._source.postings(term)
+        return self._postings.get(term)
+
+    def _weighted_postings(self, term):
+        """(doc ids, field-weighted freqs), leaving out docs where the term only occurs in 0-weight fields"""
+        posting = self._source.field_postings(term)
+        if posting is None:
+            return None
+        docs, field_tfs = posting
+        fields = len(self._field_weights)
+        kept_docs, kept_tfs = [], []
+        for i, doc in enumerate(docs):
+            tf = sum(w * field_tfs[i * fields + f] for f, w in enumerate(self._field_weights))
+            if tf > 0:
+                kept_docs.append(doc)
+                kept_tfs.append(tf)
+        return (kept_docs, kept_tfs) if kept_docs else None
+
+    def vocabulary(self):
+        """All indexed terms, sorted"""
+        if self._source is not None:
+            return self._source.terms()
+        return sorted(self._postings)
+
+    def enable_fuzzy(self):
+        """Expand query tokens missing from the vocabulary to near matches (see FuzzyIndex)"""
+        if self.fuzzy is None:
+            self.fuzzy = FuzzyIndex(self.vocabulary)
+
+    def query_terms(self, query):
+        """(term, weight) pairs to score, in query-token order.
+
+        Every token has weight 1.0; with fuzzy matching enabled, a token the
+        corpus lacks is replaced by its nearest vocabulary terms, each
+        weighted by how close it is (kept as-is when nothing is close).
+        """
+        pairs = []
+        for token in self.tokenize(query):
+            if self.fuzzy is None or self.postings(token) is not None:
+                pairs.append((token, 1.0))
+            else:
+                pairs.extend(self.fuzzy.expand(token) or [(token, 1.0)])
+        return pairs
+
+    def _idf(self, term, doc_freq):
+        """idf for term (memoized); term=None computes it for doc_freq without caching"""
+        idf = self.idf.get(term)
+        if idf is None:
+            idf = log((self.N - doc_freq + 0.5) / (doc_freq + 0.5) + 1)
+            if term is not None:
+                self.idf[term] = idf
+        return idf
+
+    def _length_norms(self):
+        """Per-doc k1 * (1 - b + b * dl / avgdl), the query-independent part of the denominator"""
+        if self._norms is None:
+            self._norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
+        return self._norms
+
+    def _max_score(self, term, docs, tfs, idf):
+        """Largest contribution a single occurrence of term can add to any doc's score"""
+        best = self._max_scores.get(term)
+        if best is None:
+            norms = self._length_norms()
+            k1p = self.k1 + 1
+            best = max(idf * (tf * k1p) / (tf + norms[idx]) for idx, tf in zip(docs, tfs))
+            self._max_scores[term] = best
+        return best
+
+    def top_k(self, query, k):
+        """Top-k (idx, score) pairs with score > 0, same as the head of score(query).
+
+        MaxScore document-at-a-time traversal: query terms are ordered by their
+        score upper bound, and terms whose combined bounds cannot lift a doc above
+        the current k-th score become non-essential. Only docs in the postings of
+        essential terms are visited, non-essential postings are probed by binary
+        search, and a doc is dropped as soon as its bound falls to the k-th score.
+        Surviving docs are rescored in query-term order so scores (and ties,
+        broken by lower idx) match exhaustive scoring exactly.
+        """
+        if self.N == 0 or k <= 0:
+            return []
+        qterms = self.query_terms(query)
+        terms = {}
+        for token, _ in qterms:
+            if token in terms:
+                continue
+            posting = self.postings(token)
+            if posting is not None:
+                docs, tfs = posting
+                idf = self._idf(token, len(docs))
+                terms[token] = (docs, tfs, idf)
+        if not terms:
+            return []
+
+        norms = self._length_norms()
+        k1p = self.k1 + 1
+        weights = defaultdict(float)
+        for token, weight in qterms:
+            if token in terms:
+                weights[token] += weight
+        # Slack keeps float rounding in the bounds from pruning a tying doc
+        bound = {t: weights[t] * self._max_score(t, *terms[t]) * _BOUND_SLACK for t in terms}
+        order = sorted(terms, key=bound.get)
+        prefix = []
+        total = 0.0
+        for t in order:
+            total += bound[t]
+            prefix.append(total)
+
+        heap = []
+        threshold = 0.0
+        first_essential = 0
+        cursors = dict.fromkeys(order, 0)
+        while True:
+            essential = order[first_essential:]
+            candidate = None
+            for t in essential:
+                docs = terms[t][0]
+                pos = cursors[t]
+                if pos < len(docs) and (candidate is None or docs[pos] < candidate):
+                    candidate = docs[pos]
+            if candidate is None:
+                break
+
+            tf_of = {}
+            upper = prefix[first_essential - 1] if first_essential else 0.0
+            for t in essential:
+                docs, tfs, idf = terms[t]
+                pos = cursors[t]
+                if pos < len(docs) and docs[pos] == candidate:
+                    tf = tfs[pos]
+                    tf_of[t] = tf
+                    cursors[t] = pos + 1
+                    upper += weights[t] * idf * (tf * k1p) / (tf + norms[candidate])
+            full = len(heap) == k
+            if full and upper <= threshold:
+                continue
+
+            for i in range(first_essential - 1, -1, -1):
+                t = order[i]
+                docs, tfs, idf = terms[t]
+                pos = bisect_left(docs, candidate, cursors[t])
+                cursors[t] = pos
+                upper -= bound[t]
+                if pos < len(docs) and docs[pos] == candidate:
+                    tf = tfs[pos]
+                    tf_of[t] = tf
+                    upper += weights[t] * idf * (tf * k1p) / (tf + norms[candidate])
+                if full and upper <= threshold:
+                    break
+            else:
+                score = 0
+                for token, weight in qterms:
+                    tf = tf_of.get(token)
+                    if tf is not None:
+                        score += weight * terms[token][2] * (tf * k1p) / (tf + norms[candidate])
+                if not full:
+                    heapq.heappush(heap, (score, -candidate))
+                elif score > threshold:
+                    heapq.heapreplace(heap, (score, -candidate))
+                else:
+                    continue
+                if len(heap) == k:
+                    threshold = heap[0][0]
+                    while first_essential < len(order) and prefix[first_essential] <= threshold:
+                        first_essential += 1
+                    if first_essential == len(order):
+                        break
+
+        return [(-neg_idx, score) for score, neg_idx in sorted(heap, reverse=True)]
+
+    def query_bound(self, query):
+        """Best score any doc in this corpus could reach for query.
+
+        Terms missing from the corpus count as if they occurred once in one
+        doc of minimal length, so a corpus that lacks part of the query gets
+        a bound it cannot actually reach. Dividing by this bound makes scores
+        comparable across corpora of different size and vocabulary.
+        """
+        if self.N == 0:
+            return 0.0
+        norms = self._length_norms()
+        k1p = self.k1 + 1
+        unseen = self._idf(None, 1) * k1p / (1 + min(norms))
+        bound = 0.0
+        for token, weight in self.query_terms(query):
+            posting = self.postings(token)
+            if posting is None:
+                bound += unseen
+            else:
+                docs, tfs = posting
+                bound += weight * self._max_score(token, docs, tfs, self._idf(token, len(docs)))
+        return bound
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+    def score(self, query):
+        """Score all documents against query"""
+        if self.N == 0:
+            return []
+        scores = [0] * self.N
+        norms = self._length_norms()
+        for token, weight in self.query_terms(query):
+            posting = self.postings(token)
+            if posting is None:
+                continue
+            docs, tfs = posting
+            idf = self._idf(token, len(docs))
+            for idx, tf in zip(docs, tfs):
+                scores[idx] += weight * idf * (tf * (self.k1 + 1)) / (tf + norms[idx])
+
+        return sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
+
+
+# ============ FUZZY MATCHING ============
+def _edit_distance(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it must exceed limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyIndex:
+    """Typo and prefix candidates for query tokens, drawn from a corpus vocabulary.
+
+    Prefixes are found by bisecting the sorted vocabulary; typos through a
+    trigram index, so only terms sharing a trigram with the token are ever
+    compared by edit distance. Both indexes are built on first use.
+    """
+
+    MIN_LENGTH = 3     # shorter tokens are too ambiguous to expand
+    MAX_EXPANSIONS = 3
+    PREFIX_SCAN = 64   # completions looked at per prefix
+
+    def __init__(self, vocabulary):
+        self._vocabulary = vocabulary  # callable returning the sorted terms
+        self._terms = None
+        self._grams = None
+
+    def _index(self):
+        if self._terms is None:
+            terms = self._vocabulary()
+            grams = defaultdict(list)
+            for term_id, term in enumerate(terms):
+                for gram in self._trigrams(term):
+                    grams[gram].append(term_id)
+            # _grams before _terms: another thread seeing _terms set may use _grams right away
+            self._grams = dict(grams)
+            self._terms = terms
+        return self._terms
+
+    @staticmethod
+    def _trigrams(word):
+        padded = f"^{word}$"
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def prefix_matches(self, token):
+        """Shortest vocabulary terms that start with token"""
+        terms = self._index()
+        start = bisect_left(terms, token)
+        matches = []
+        for i in range(start, min(len(terms), start + self.PREFIX_SCAN)):
+            if not terms[i].startswith(token):
+                break
+            if terms[i] != token:
+                matches.append(terms[i])
+        return sorted(matches, key=len)[:self.MAX_EXPANSIONS]
+
+    def typo_matches(self, token):
+        """Vocabulary terms within 1 edit (2 for tokens over 5 chars) as (term, distance)"""
+        terms = self._index()
+        limit = 1 if len(token) <= 5 else 2
+        grams = self._trigrams(token)
+        shared = defaultdict(int)
+        for gram in grams:
+            for term_id in self._grams.get(gram, ()):
+                shared[term_id] += 1
+        # Each edit touches at most 3 trigrams, so closer terms share at least this many
+        needed = len(grams) - 3 * limit
+        matches = []
+        for term_id in sorted(shared, key=lambda t: (-shared[t], t)):
+            if shared[term_id] < needed:
+                break
+            distance = _edit_distance(token, terms[term_id], limit)
+            if distance <= limit:
+                matches.append((distance, terms[term_id]))
+        return [(term, distance) for distance, term in sorted(matches)[:self.MAX_EXPANSIONS]]
+
+    def expand(self, token):
+        """Up to MAX_EXPANSIONS (term, weight) pairs for token, best first; weight is in (0, 1)"""
+        if len(token) < self.MIN_LENGTH:
+            return []
+        # A token that starts some term is most likely a partial name; only
+        # otherwise is it treated as a typo
+        weights = {term: len(token) / len(term) for term in self.prefix_matches(token)}
+        if not weights:
+            weights = {term: 1 - distance / max(len(token), len(term))
+                       for term, distance in self.typo_matches(token)}
+        return sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+
+
+# ============ DOMAIN DETECTION ============
+DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb", "token", "semantic", "accent", "destructive", "muted", "foreground"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
+    "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard", "fitness", "restaurant", "hotel", "travel", "music", "education", "learning", "legal", "insurance", "medical", "beauty", "pharmacy", "dental", "pet", "dating", "wedding", "recipe", "delivery", "ride", "booking", "calendar", "timer", "tracker", "diary", "note", "chat", "messenger", "crm", "invoice", "parking", "transit", "vpn", "alarm", "weather", "sleep", "meditation", "fasting", "habit", "grocery", "meme", "wardrobe", "plant care", "reading", "flashcard", "puzzle", "trivia", "arcade", "photography", "streaming", "podcast", "newsletter", "marketplace", "freelancer", "coworking", "airline", "museum", "theater", "church", "non-profit", "charity", "kindergarten", "daycare", "senior care", "veterinary", "florist", "bakery", "brewery", "construction", "automotive", "real estate", "logistics", "agriculture", "coding bootcamp"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora", "prompt", "css", "implementation", "variable", "checklist", "tailwind"],
+    "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
+    "typography": ["font pairing", "typography pairing", "heading font", "body font"],
+    "google-fonts": ["google font", "font family", "font weight", "font style", "variable font", "noto", "font for", "find font", "font subset", "font language", "monospace font", "serif font", "sans serif font", "display font", "handwriting font", "font", "typography", "serif", "sans"],
+    "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
+    "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
+    "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
+}
 
-            scores.append((idx, score))
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+def _is_word_char(ch):
+    """Same character class as regex \\w, which decides \\b boundaries"""
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Character trie over keywords, matched in one left-to-right scan.
+
+    A keyword is reported wherever re.search(r'\\b' + re.escape(kw) + r'\\b')
+    would find it, including overlapping hits and keywords that prefix
+    each other ("font" and "font for").
+    """
+
+    _END = ""
+
+    def __init__(self, keywords):
+        self.root = {}
+        for kw in keywords:
+            node = self.root
+            for ch in kw:
+                node = node.setdefault(ch, {})
+            node[self._END] = kw
+
+    def find_all(self, text):
+        """Return the set of keywords found in text on word boundaries"""
+        found = set()
+        n = len(text)
+        word = [_is_word_char(ch) for ch in text]
+        for start in range(n):
+            node = self.root.get(text[start])
+            if node is None:
+                continue
+            if (start > 0 and word[start - 1]) == word[start]:
+                continue
+            end = start
+            while True:
+                end += 1
+                kw = node.get(self._END)
+                if kw is not None and word[end - 1] != (end < n and word[end]):
+                    found.add(kw)
+                if end == n:
+                    break
+                node = node.get(text[end])
+                if node is None:
+                    break
+        return found
+
+
+def _build_domain_matcher():
+    """(keyword -> domains it votes for, KeywordMatcher over those keywords); a keyword may belong to several domains"""
+    keyword_domains = defaultdict(list)
+    for domain, keywords in DOMAIN_KEYWORDS.items():
+        for kw in keywords:
+            keyword_domains[kw].append(domain)
+    return keyword_domains, KeywordMatcher(keyword_domains)
+
+
+_KEYWORD_DOMAINS, _DOMAIN_MATCHER = _build_domain_matcher()
 
 
 # ============ SEARCH FUNCTIONS ============
-def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+# (filepath, index options) -> (CSV signature, compiled corpus, BM25 over it)
+_INDEX_CACHE = {}
+
+# Searches may run on several threads (design_system --parallel). An index is
+# built under its own lock so concurrent first searches of one file share a
+# single build while different files still load side by side; the result LRU
+# is guarded as a whole. BM25's lazy per-term memos only ever store the same
+# value for a key, so they need no lock.
+_INDEX_LOCKS = {}
+_INDEX_LOCKS_GUARD = threading.Lock()
+_RESULT_LOCK = threading.Lock()
+
+# Bounded LRU of ranked results:
+# (filepath, index options, output_cols, query tokens, max_results, corpus version) -> rows
+RESULT_CACHE_SIZE = 256
+_RESULT_CACHE = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _file_signature(filepath):
+    """Cheap change marker for a data file: (mtime_ns, size)"""
+    st = filepath.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def compiled_path_for(filepath):
+    """Location of the compiled corpus for a data CSV (stacks/react.csv -> _compiled/stacks__react.uxc).
+
+    One file per CSV: its header records the search columns it was built
+    for and corpus.load rebuilds it when they differ. Field weights, k1 and
+    b are applied when BM25 is fit, so changing them never stales the file.
+    """
+    relative = filepath.relative_to(DATA_DIR).with_suffix(".uxc")
+    return COMPILED_DIR / "__".join(relative.parts)
+
+
+def load_corpus(filepath, search_cols):
+    """Open the compiled corpus for a data CSV, compiling it first if it is missing or stale"""
+    return corpus.load(filepath, compiled_path_for(filepath), search_cols, tokenize, TOKENIZER_VERSION)
+
+
+def _stack_config(stack):
+    """Search config of a stack, shaped like a CSV_CONFIG entry"""
+    return {"file": STACK_CONFIG[stack]["file"], **_STACK_COLS}
+
+
+def corpus_targets():
+    """(data file, search_cols) of every searchable CSV, domains then stacks"""
+    return [(config["file"], config["search_cols"]) for _, config in _unified_sources()]
+
+
+def _index_options(config):
+    """Hashable index setup of a config: (search_cols, fuzzy, k1, b, field weights); None k1/b = BM25 default"""
+    weights = config.get("field_weights", {})
+    return (tuple(config["search_cols"]), config.get("fuzzy", False), config.get("k1"), config.get("b"),
+            tuple(weights.get(col, 1.0) for col in config["search_cols"]))
+
+
+def _load_index(filepath, config, signature=None):
+    """Return (compiled corpus, BM25) for a data file, reusing them while the file is unchanged"""
+    options = _index_options(config)
+    key = (filepath, options)
+    if signature is None:
+        signature = _file_signature(filepath)
+    cached = _INDEX_CACHE.get(key)
+    if cached and cached[0] == signature:
+        return cached[1], cached[2]
+
+    with _INDEX_LOCKS_GUARD:
+        lock = _INDEX_LOCKS.setdefault(key, threading.Lock())
+    with lock:
+        cached = _INDEX_CACHE.get(key)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+
+        search_cols, fuzzy, k1, b, weights = options
+        compiled = load_corpus(filepath, search_cols)
+        bm25 = BM25(**{name: value for name, value in (("k1", k1), ("b", b)) if value is not None})
+        bm25.fit_corpus(compiled, weights)
+        if fuzzy:
+            bm25.enable_fuzzy()
+        _INDEX_CACHE[key] = (signature, compiled, bm25)
+    return compiled, bm25
+
+
+def cache_info():
+    """Result cache counters: hits, misses, current size and capacity"""
+    with _RESULT_LOCK:
+        return {**_cache_stats, "size": len(_RESULT_CACHE), "maxsize": RESULT_CACHE_SIZE}
+
+
+def cache_clear(indexes=False):
+    """Drop all cached results and reset the counters.
+
+    indexes=True also drops the loaded indexes, so the next search of each
+    file reopens its compiled corpus and refits BM25 (a cold start).
+    """
+    with _RESULT_LOCK:
+        _RESULT_CACHE.clear()
+        _cache_stats.update(hits=0, misses=0)
+    if indexes:
+        with _INDEX_LOCKS_GUARD:
+            _INDEX_CACHE.clear()
+
+
+def _cache_get(key):
+    """Copies of the cached rows for key, or None on a miss (counted either way)"""
+    with _RESULT_LOCK:
+        cached = _RESULT_CACHE.get(key)
+        if cached is None:
+            _cache_stats["misses"] += 1
+            return None
+        _RESULT_CACHE.move_to_end(key)
+        _cache_stats["hits"] += 1
+    return [dict(row) for row in cached]
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
+def _cache_put(key, results):
+    """Store rows under key, evicting the least recently used entry when full; returns copies"""
+    with _RESULT_LOCK:
+        _RESULT_CACHE[key] = results
+        if len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+    return [dict(row) for row in results]
+
+
+def _search_csv(filepath, config, query, max_results):
+    """Core search function using BM25, set up from a CSV_CONFIG-style entry"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
-
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
-
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+    # The file signature doubles as the corpus version: editing the CSV changes
+    # the key, so stale entries are never hit and simply age out of the LRU.
+    signature = _file_signature(filepath)
+    compiled, bm25 = _load_index(filepath, config, signature)
+    output_cols = config["output_cols"]
+    key = (filepath, _index_options(config), tuple(output_cols), tuple(bm25.tokenize(query)), max_results, signature)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
-    return results
+    # Top results with score > 0, decoding only their output columns
+    return _cache_put(key, [compiled.row(idx, output_cols) for idx, _ in bm25.top_k(query, max_results)])
 
 
 def detect_domain(query):
     """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb", "token", "semantic", "accent", "destructive", "muted", "foreground"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard", "fitness", "restaurant", "hotel", "travel", "music", "education", "learning", "legal", "insurance", "medical", "beauty", "pharmacy", "dental", "pet", "dating", "wedding", "recipe", "delivery", "ride", "booking", "calendar", "timer", "tracker", "diary", "note", "chat", "messenger", "crm", "invoice", "parking", "transit", "vpn", "alarm", "weather", "sleep", "meditation", "fasting", "habit", "grocery", "meme", "wardrobe", "plant care", "reading", "flashcard", "puzzle", "trivia", "arcade", "photography", "streaming", "podcast", "newsletter", "marketplace", "freelancer", "coworking", "airline", "museum", "theater", "church", "non-profit", "charity", "kindergarten", "daycare", "senior care", "veterinary", "florist", "bakery", "brewery", "construction", "automotive", "real estate", "logistics", "agriculture", "coding bootcamp"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora", "prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font pairing", "typography pairing", "heading font", "body font"],
-        "google-fonts": ["google font", "font family", "font weight", "font style", "variable font", "noto", "font for", "find font", "font subset", "font language", "monospace font", "serif font", "sans serif font", "display font", "handwriting font", "font", "typography", "serif", "sans"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
-    }
-
-    scores = {domain: sum(1 for kw in keywords if re.search(r'\b' + re.escape(kw) + r'\b', query_lower)) for domain, keywords in domain_keywords.items()}
+    scores = dict.fromkeys(DOMAIN_KEYWORDS, 0)
+    for keyword in _DOMAIN_MATCHER.find_all(query.lower()):
+        for domain in _KEYWORD_DOMAINS[keyword]:
+            scores[domain] += 1
     best = max(scores, key=scores.get)
     return best if scores[best] > 0 else "style"
 
@@ -229,7 +800,7 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    results = _search_csv(filepath, config, query, max_results)
 
     return {
         "domain": domain,
@@ -250,7 +821,7 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    results = _search_csv(filepath, _stack_config(stack), query, max_results)
 
     return {
         "domain": "stack",
@@ -260,3 +831,95 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+def _unified_sources():
+    """Every searchable corpus as (tag, config); stacks are tagged "stack:<name>"."""
+    yield from CSV_CONFIG.items()
+    for stack in STACK_CONFIG:
+        yield f"stack:{stack}", _stack_config(stack)
+
+
+def _unified_signatures():
+    """Existing unified sources with their file signatures: ([(tag, path, config)], signatures)"""
+    sources = [(tag, DATA_DIR / config["file"], config)
+               for tag, config in _unified_sources()
+               if (DATA_DIR / config["file"]).exists()]
+    return sources, tuple(_file_signature(filepath) for _, filepath, _ in sources)
+
+
+def _rank_all(query, max_results, sources, signatures):
+    """Merged top hits of every source as (tag, compiled corpus, idx, output_cols), best first"""
+    candidates = []
+    for order, ((tag, filepath, config), signature) in enumerate(zip(sources, signatures)):
+        compiled, bm25 = _load_index(filepath, config, signature)
+        output_cols = config["output_cols"]
+        hits = bm25.top_k(query, max_results)
+        if not hits:
+            continue
+        bound = bm25.query_bound(query)
+        for rank, (idx, score) in enumerate(hits):
+            candidates.append((-score / bound, order, rank, tag, compiled, idx, output_cols))
+    return [(tag, compiled, idx, output_cols)
+            for _, _, _, tag, compiled, idx, output_cols in sorted(candidates)[:max_results]]
+
+
+def search_all(query, max_results=MAX_RESULTS):
+    """Search every domain and stack at once and merge the results.
+
+    Each corpus contributes its own top hits; their BM25 scores are divided
+    by that corpus's query_bound() so they can be ranked together. Every
+    result row is tagged with its "Domain" (or "stack:<name>") first.
+    """
+    sources, signatures = _unified_signatures()
+    tokens = tuple(tokenize(query))
+    key = ("all", tokens, max_results, signatures)
+    results = _cache_get(key)
+    if results is None:
+        results = _cache_put(key, [{"Domain": tag, **compiled.row(idx, output_cols)}
+                                   for tag, compiled, idx, output_cols in _rank_all(query, max_results, sources, signatures)])
+
+    return {
+        "domain": "all",
+        "query": query,
+        "file": "all",
+        "count": len(results),
+        "results": results
+    }
+
+
+def _project(output_cols, fields):
+    """Columns to decode: output_cols, or the requested fields among them (in request order)"""
+    if fields is None:
+        return output_cols
+    return [field for field in fields if field in output_cols]
+
+
+def iter_results(query, domain=None, stack=None, unified=False, max_results=MAX_RESULTS, fields=None):
+    """Yield result rows one at a time, best first, decoding only the projected fields.
+
+    Picks the corpus like the CLI does (stack, then unified, then domain or
+    auto-detected domain). Ranking only touches postings; each row's cells
+    are decoded when it is yielded, so a consumer can write it out before
+    the next one is built. Bypasses the result cache. Unified rows keep
+    their leading "Domain" tag. Raises ValueError for an unknown stack.
+    """
+    if stack is not None:
+        if stack not in STACK_CONFIG:
+            raise ValueError(f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}")
+        config = _stack_config(stack)
+    elif unified:
+        sources, signatures = _unified_signatures()
+        for tag, compiled, idx, output_cols in _rank_all(query, max_results, sources, signatures):
+            yield {"Domain": tag, **compiled.row(idx, _project(output_cols, fields))}
+        return
+    else:
+        config = CSV_CONFIG.get(domain or detect_domain(query), CSV_CONFIG["style"])
+
+    filepath = DATA_DIR / config["file"]
+    if not filepath.exists():
+        return
+    compiled, bm25 = _load_index(filepath, config)
+    cols = _project(config["output_cols"], fields)
+    for idx, _ in bm25.top_k(query, max_results):
+        yield compiled.row(idx, cols)
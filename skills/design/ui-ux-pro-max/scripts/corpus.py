@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Corpus - compact columnar files compiled from the CSV data
+Usage: python corpus.py build [--force]
+
+Each searchable CSV is compiled once into data/_compiled/<name>.uxc:
+
+  "UXC1" | u32 header length | JSON header | padding | sections
+
+Sections are native-endian uint32 arrays or UTF-8 blobs, 4-byte aligned:
+  str_offsets   S+1 offsets into str_blob
+  str_blob      every distinct cell value, interned once
+  cells         one array of N string ids per column (column-major)
+  term_offsets  V+1 offsets into term_blob
+  term_blob     vocabulary of the search columns, sorted by UTF-8 bytes
+  post_offsets  V+1 offsets into post_docs / post_tfs
+  post_docs     ascending doc ids per term
+  post_tfs      term frequency for each (term, doc)
+  doc_lengths   token count per doc
+  post_field_tfs  F per (term, doc): its frequency in each search column
+  field_lengths   F per doc: token count of each search column
+
+core mmaps the file, so loading costs a header parse: scoring touches only
+the postings of the query terms and only the output columns of the top-k
+rows are ever decoded. The per-field sections let core weight search
+columns differently (BM25F) without re-tokenizing anything. A compiled
+file is rebuilt automatically when its CSV, the search columns, the
+tokenizer or the format change.
+"""
+
+import csv
+import json
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from collections import Counter
+
+MAGIC = b"UXC1"
+FORMAT_VERSION = 3
+NONE_ID = 0xFFFFFFFF  # cell missing from a short CSV row (csv.DictReader gives None)
+
+_U32 = "I"
+assert array(_U32).itemsize == 4
+
+_SECTIONS = ["str_offsets", "str_blob", "cells", "term_offsets", "term_blob",
+             "post_offsets", "post_docs", "post_tfs", "doc_lengths",
+             "post_field_tfs", "field_lengths"]
+
+
+# ============ BUILD ============
+def _source_signature(csv_path):
+    st = csv_path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def build(csv_path, search_cols, tokenize, tokenizer_version):
+    """Compile a CSV into the corpus file format and return its bytes"""
+    signature = _source_signature(csv_path)
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        columns = list(reader.fieldnames or [])
+
+    # Interned string table + column-major cell ids
+    string_ids = {}
+    strings = []
+    cells = array(_U32)
+    for col in columns:
+        for row in rows:
+            value = row.get(col)
+            if value is None:
+                cells.append(NONE_ID)
+                continue
+            sid = string_ids.get(value)
+            if sid is None:
+                sid = string_ids[value] = len(strings)
+                strings.append(value)
+            cells.append(sid)
+
+    # Pre-tokenized search fields -> postings, with each field's share kept
+    n_fields = len(search_cols)
+    doc_lengths = array(_U32)
+    field_lengths = array(_U32)
+    postings = {}
+    for doc_id, row in enumerate(rows):
+        field_counts = []
+        for col in search_cols:
+            tokens = tokenize(str(row.get(col, "")))
+            field_lengths.append(len(tokens))
+            field_counts.append(Counter(tokens))
+        doc_lengths.append(sum(field_lengths[-n_fields:]) if n_fields else 0)
+        for term in dict.fromkeys(term for counts in field_counts for term in counts):
+            postings.setdefault(term, []).append((doc_id, [counts[term] for counts in field_counts]))
+
+    encoded_terms = sorted((term.encode('utf-8'), term) for term in postings)
+    post_offsets = array(_U32, [0])
+    post_docs = array(_U32)
+    post_tfs = array(_U32)
+    post_field_tfs = array(_U32)
+    for _, term in encoded_terms:
+        for doc_id, tfs in postings[term]:
+            post_docs.append(doc_id)
+            post_tfs.append(sum(tfs))
+            post_field_tfs.extend(tfs)
+        post_offsets.append(len(post_docs))
+
+    str_offsets, str_blob = _pack_strings(s.encode('utf-8') for s in strings)
+    term_offsets, term_blob = _pack_strings(b for b, _ in encoded_terms)
+
+    payloads = {
+        "str_offsets": str_offsets.tobytes(),
+        "str_blob": str_blob,
+        "cells": cells.tobytes(),
+        "term_offsets": term_offsets.tobytes(),
+        "term_blob": term_blob,
+        "post_offsets": post_offsets.tobytes(),
+        "post_docs": post_docs.tobytes(),
+        "post_tfs": post_tfs.tobytes(),
+        "doc_lengths": doc_lengths.tobytes(),
+        "post_field_tfs": post_field_tfs.tobytes(),
+        "field_lengths": field_lengths.tobytes(),
+    }
+    sections = {}
+    body = bytearray()
+    for name in _SECTIONS:
+        data = payloads[name]
+        sections[name] = [len(body), len(data)]
+        body += data
+        body += b"\0" * (-len(body) % 4)
+
+    n = len(rows)
+    header = {
+        "format": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "tokenizer": tokenizer_version,
+        "source": signature,
+        "columns": columns,
+        "search_cols": list(search_cols),
+        "rows": n,
+        "terms": len(encoded_terms),
+        "avgdl": sum(doc_lengths) / n if n else 0,
+        "sections": sections,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    prefix = MAGIC + len(header_bytes).to_bytes(4, "little") + header_bytes
+    prefix += b"\0" * (-len(prefix) % 4)
+    return prefix + bytes(body)
+
+
+def _pack_strings(encoded):
+    offsets = array(_U32, [0])
+    blob = bytearray()
+    for b in encoded:
+        blob += b
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+# ============ READ ============
+class Corpus:
+    """Read-only view over a compiled corpus held in an mmap or bytes buffer"""
+
+    def __init__(self, buffer):
+        self._buffer = buffer  # keeps the mmap alive
+        view = memoryview(buffer)
+        if bytes(view[:4]) != MAGIC:
+            raise ValueError("not a corpus file")
+        header_len = int.from_bytes(view[4:8], "little")
+        self.header = json.loads(bytes(view[8:8 + header_len]))
+        base = 8 + header_len
+        base += -base % 4
+
+        def section(name, fmt=None):
+            start, size = self.header["sections"][name]
+            data = view[base + start: base + start + size]
+            return data.cast(fmt) if fmt else data
+
+        self.columns = self.header["columns"]
+        self.N = self.header["rows"]
+        self.avgdl = self.header["avgdl"]
+        self._col_index = {col: i for i, col in enumerate(self.columns)}
+        self._str_offsets = section("str_offsets", _U32)
+        self._str_blob = section("str_blob")
+        self._cells = section("cells", _U32)
+        self._term_offsets = section("term_offsets", _U32)
+        self._term_blob = section("term_blob")
+        self._post_offsets = section("post_offsets", _U32)
+        self._post_docs = section("post_docs", _U32)
+        self._post_tfs = section("post_tfs", _U32)
+        self.doc_lengths = section("doc_lengths", _U32)
+        self.fields = len(self.header["search_cols"])
+        self._post_field_tfs = section("post_field_tfs", _U32)
+        self.field_lengths = section("field_lengths", _U32)  # doc * fields + field
+
+    def matches(self, signature, search_cols, tokenizer_version):
+        h = self.header
+        return (h["format"] == FORMAT_VERSION and h["byteorder"] == sys.byteorder
+                and h["tokenizer"] == tokenizer_version and h["source"] == signature
+                and h["search_cols"] == list(search_cols))
+
+    def _term(self, term_id):
+        return self._term_blob[self._term_offsets[term_id]:self._term_offsets[term_id + 1]].tobytes()
+
+    def terms(self):
+        """Decode the whole vocabulary, in sorted order"""
+        return [str(self._term(i), 'utf-8') for i in range(self.header["terms"])]
+
+    def _term_id(self, term):
+        key = term.encode('utf-8')
+        lo, hi = 0, self.header["terms"]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.header["terms"] or self._term(lo) != key:
+            return None
+        return lo
+
+    def postings(self, term):
+        """Return (doc ids, term freqs) for a term, or None if it never occurs"""
+        term_id = self._term_id(term)
+        if term_id is None:
+            return None
+        start, end = self._post_offsets[term_id], self._post_offsets[term_id + 1]
+        return self._post_docs[start:end], self._post_tfs[start:end]
+
+    def field_postings(self, term):
+        """Return (doc ids, per-field freqs) for a term, or None; freqs hold `fields` values per doc"""
+        term_id = self._term_id(term)
+        if term_id is None:
+            return None
+        start, end = self._post_offsets[term_id], self._post_offsets[term_id + 1]
+        return self._post_docs[start:end], self._post_field_tfs[start * self.fields:end * self.fields]
+
+    def cell(self, row, col):
+        """Decode one cell; None where the CSV row was short"""
+        sid = self._cells[self._col_index[col] * self.N + row]
+        if sid == NONE_ID:
+            return None
+        return str(self._str_blob[self._str_offsets[sid]:self._str_offsets[sid + 1]], 'utf-8')
+
+    def row(self, row, cols):
+        """Decode only the requested columns of one row"""
+        return {col: self.cell(row, col) for col in cols if col in self._col_index}
+
+
+def _open(path):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("empty corpus file")
+        return Corpus(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def load(csv_path, compiled_path, search_cols, tokenize, tokenizer_version):
+    """Open the compiled corpus for csv_path, (re)building it when stale.
+
+    Falls back to an in-memory corpus when the compiled file cannot be
+    written (e.g. a read-only skill directory).
+    """
+    signature = _source_signature(csv_path)
+    try:
+        corpus = _open(compiled_path)
+        if corpus.matches(signature, search_cols, tokenizer_version):
+            return corpus
+    except (OSError, ValueError, KeyError, TypeError):  # missing, foreign or truncated file
+        pass
+
+    data = build(csv_path, search_cols, tokenize, tokenizer_version)
+    try:
+        compiled_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=compiled_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, compiled_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return _open(compiled_path)
+    except OSError:
+        return Corpus(data)
+
+
+# ============ CLI ============
+if __name__ == "__main__":
+    import argparse
+    from core import DATA_DIR, COMPILED_DIR, compiled_path_for, corpus_targets, load_corpus
+
+    parser = argparse.ArgumentParser(description="Compile UI/UX Pro Max CSV data into corpus files")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--force", action="store_true", help="Rebuild even if compiled files are fresh")
+    args = parser.parse_args()
+
+    targets = corpus_targets()
+    if args.force:
+        for name, _ in targets:
+            compiled_path_for(DATA_DIR / name).unlink(missing_ok=True)
+
+    total_csv = total_compiled = 0
+    for name, search_cols in targets:
+        csv_path = DATA_DIR / name
+        if not csv_path.exists():
+            continue
+        corpus = load_corpus(csv_path, search_cols)
+        compiled = compiled_path_for(csv_path)
+        csv_size = csv_path.stat().st_size
+        compiled_size = compiled.stat().st_size if compiled.exists() else 0
+        total_csv += csv_size
+        total_compiled += compiled_size
+        print(f"{name:28s} rows={corpus.N:5d} terms={corpus.header['terms']:6d} "
+              f"csv={csv_size:8d}B compiled={compiled_size:8d}B")
+    print(f"\nCompiled into {COMPILED_DIR}: csv={total_csv}B compiled={total_compiled}B")
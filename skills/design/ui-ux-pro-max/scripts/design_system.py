@@ -11,34 +11,402 @@ Usage:
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+
+    # Independent domain searches on a thread pool
+    result = generate_design_system("SaaS dashboard", "My Project", parallel=True)
+
+    # Category skeletons from data/_compiled/design-snapshots.json (built on first use)
+    result = generate_design_system("SaaS dashboard", "My Project", snapshot=True)
+
+    # Also print the palette's failing WCAG contrast pairs (always in the "contrast" field)
+    result = generate_design_system("SaaS dashboard", "My Project", contrast_warnings=True)
 """
 
 import csv
+import hashlib
 import json
 import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, CSV_CONFIG, COMPILED_DIR, DATA_DIR, TOKENIZER_VERSION, _index_options
+import templates
 
 
 # ============ CONFIGURATION ============
 REASONING_FILE = "ui-reasoning.csv"
 
+# Only style is re-ranked (_select_best_match); the other domains use their top hit
 SEARCH_CONFIG = {
     "product": {"max_results": 1},
     "style": {"max_results": 3},
-    "color": {"max_results": 2},
-    "landing": {"max_results": 2},
-    "typography": {"max_results": 2}
+    "color": {"max_results": 1},
+    "landing": {"max_results": 1},
+    "typography": {"max_results": 1}
 }
 
+# Category snapshots (see CategorySnapshots): one skeleton per product type
+SNAPSHOT_FILE = "design-snapshots.json"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DOMAINS = ("color", "landing")  # answered from the skeleton; style/typography stay query-specific
+SNAPSHOT_RESULTS = ("style", "color", "landing", "typography")  # result lists kept per skeleton
+
+# Searches behind a page override (_generate_intelligent_overrides), run on "<page> <page query>"
+OVERRIDE_SEARCH_CONFIG = {
+    "style": {"max_results": 1},
+    "ux": {"max_results": 3},
+    "landing": {"max_results": 1}
+}
+
+
+# ============ REASONING INDEX ============
+class ReasoningIndex:
+    """Reasoning rules indexed once for the three lookup passes of _find_reasoning_rule.
+
+    Each pass returns the first rule in file order that matches, as a linear
+    scan would:
+      1. exact:    UI_Category == category (case-insensitive)  -> dict
+      2. partial:  UI_Category in category                     -> dict, probed with every substring of category
+                   category in UI_Category                     -> trigram index, candidates verified
+      3. keyword:  any word of UI_Category in category         -> dict, probed with every substring of category
+    Lookups cost O(len(category)^2) dict probes, independent of the number
+    of rules, and are memoized per category.
+    """
+
+    def __init__(self, rules: list):
+        self.rules = rules
+        self._lowered = []
+        self._exact = {}
+        self._keywords = {}
+        self._trigrams = defaultdict(set)
+        self._memo = {}
+        for idx, rule in enumerate(rules):
+            ui_cat = rule.get("UI_Category", "").lower()
+            self._lowered.append(ui_cat)
+            self._exact.setdefault(ui_cat, idx)
+            for kw in ui_cat.replace("/", " ").replace("-", " ").split():
+                self._keywords.setdefault(kw, idx)
+            for gram in self._grams(ui_cat):
+                self._trigrams[gram].add(idx)
+        self._parsed = [self._parse(rule) for rule in rules]
+
+    @staticmethod
+    def _grams(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @staticmethod
+    def _parse(rule: dict) -> dict:
+        """Reasoning fields of a rule, with Decision_Rules JSON and Style_Priority pre-parsed."""
+        decision_rules = {}
+        try:
+            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
+        except (json.JSONDecodeError, TypeError):
+            pass
+        return {
+            "pattern": rule.get("Recommended_Pattern", ""),
+            "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
+            "color_mood": rule.get("Color_Mood", ""),
+            "typography_mood": rule.get("Typography_Mood", ""),
+            "key_effects": rule.get("Key_Effects", ""),
+            "anti_patterns": rule.get("Anti_Patterns", ""),
+            "decision_rules": decision_rules,
+            "severity": rule.get("Severity", "MEDIUM")
+        }
+
+    def find(self, category: str):
+        """Index of the rule matching category, or None."""
+        category_lower = category.lower()
+        if category_lower not in self._memo:
+            self._memo[category_lower] = self._find(category_lower)
+        return self._memo[category_lower]
+
+    def _find(self, category_lower: str):
+        idx = self._exact.get(category_lower)
+        if idx is not None:
+            return idx
+
+        n = len(category_lower)
+        substrings = {category_lower[i:j] for i in range(n + 1) for j in range(i, n + 1)}
+
+        # Partial: UI_Category inside category, or category inside UI_Category
+        found = [self._exact[sub] for sub in substrings if sub in self._exact]
+        if n >= 3:
+            grams = iter(self._grams(category_lower))
+            candidates = set(self._trigrams.get(next(grams), ()))
+            for gram in grams:
+                candidates &= self._trigrams.get(gram, set())
+        else:
+            candidates = range(len(self.rules))
+        found.extend(idx for idx in candidates if category_lower in self._lowered[idx])
+        if found:
+            return min(found)
+
+        # Keyword: any word of UI_Category inside category
+        found = [self._keywords[sub] for sub in substrings if sub in self._keywords]
+        return min(found) if found else None
+
+    def reasoning(self, idx: int) -> dict:
+        """Pre-parsed reasoning of rule idx (a fresh copy the caller may modify)."""
+        parsed = self._parsed[idx]
+        return {**parsed, "style_priority": list(parsed["style_priority"]),
+                "decision_rules": dict(parsed["decision_rules"])}
+
+
+# Worker threads for generate_batch
+BATCH_WORKERS = min(8, os.cpu_count() or 1)
+
+
+# ============ PARALLEL SEARCH ============
+class SearchFanout:
+    """Thread pool for the independent searches of one design-system run.
+
+    Each distinct (query, domain, max_results) is submitted once; asking for
+    it again returns the same future. Workers share core's index and result
+    caches, so a search finished here is a cache hit for any plain search()
+    issued later in the run.
+    """
+
+    MAX_WORKERS = len(SEARCH_CONFIG) + len(OVERRIDE_SEARCH_CONFIG)
+
+    def __init__(self, max_workers: int = None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or self.MAX_WORKERS,
+                                            thread_name_prefix="design-search")
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, query: str, domain: str, max_results: int) -> Future:
+        """Start a search (or join the identical one already started)."""
+        key = (query, domain, max_results)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._futures[key] = self._executor.submit(search, query, domain, max_results)
+        return future
+
+    def search(self, query: str, domain: str, max_results: int) -> dict:
+        """Result of a search, waiting for it if it is still running."""
+        return self.submit(query, domain, max_results).result()
+
+    def close(self):
+        """Wait for every submitted search and stop the workers."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ============ CATEGORY SNAPSHOTS ============
+class CategorySnapshots:
+    """Design-system skeletons per product type, precomputed into data/_compiled/.
+
+    generate() maps every query onto one of the product types, and the
+    reasoning rule, palette and landing pattern follow from that type. A
+    skeleton holds what the generator resolves when the query is the
+    category name itself: the reasoning, its selected style and the top
+    color and typography hits, plus the landing pattern the reasoning rule
+    recommends. With snapshots, generate() runs only the product search
+    plus the query-specific style and typography searches, and falls back
+    to the skeleton's style/typography when the query finds none.
+
+    File layout: a JSON header line ({"signature", "rows", "offsets"}), then
+    one compact JSON line per distinct result row (styles, pairings and
+    patterns recur across categories) and one per category, whose result
+    lists hold row numbers. A lookup parses the header, one category line
+    and the few rows it names. The file is rebuilt when a CSV it was
+    derived from, the search setup or the tokenizer changes, and kept in
+    memory when it cannot be written.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else COMPILED_DIR / SNAPSHOT_FILE
+        self._signature = None
+        self._offsets = None   # category -> [start, length] after the header
+        self._row_offsets = None  # row number -> [start, length]
+        self._base = 0
+        self._skeletons = {}   # parsed so far (everything, when built in this process)
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def signature() -> list:
+        """Everything a skeleton depends on, as JSON-comparable values."""
+        domains = ["product"] + [domain for domain in SEARCH_CONFIG if domain != "product"]
+        sources = []
+        for name in [REASONING_FILE] + [CSV_CONFIG[domain]["file"] for domain in domains]:
+            try:
+                st = (DATA_DIR / name).stat()
+                sources.append([name, st.st_mtime_ns, st.st_size])
+            except OSError:
+                sources.append([name, None, None])
+        setup = [[domain, repr(_index_options(CSV_CONFIG[domain])), CSV_CONFIG[domain]["output_cols"]] for domain in domains]
+        return [SNAPSHOT_VERSION, TOKENIZER_VERSION, SEARCH_CONFIG, sources, setup]
+
+    def get(self, category: str):
+        """Skeleton for a product type, or None if there is none."""
+        signature = self.signature()
+        with self._lock:
+            if self._signature != signature:
+                self._skeletons, self._rows = {}, {}
+                if not self._open(signature):
+                    self._skeletons = self.build()
+                    self._offsets = None
+                    self._write(signature, self._skeletons)
+                self._signature = signature
+            skeleton = self._skeletons.get(category)
+            if skeleton is None and self._offsets and category in self._offsets:
+                skeleton = self._skeletons[category] = self._read(category)
+        if skeleton is None:
+            return None
+        reasoning = skeleton["reasoning"]
+        return {**skeleton, "reasoning": {**reasoning, "style_priority": list(reasoning["style_priority"]),
+                                          "decision_rules": dict(reasoning["decision_rules"])}}
+
+    def build(self) -> dict:
+        """Resolve the skeleton of every product type in the product CSV."""
+        generator = DesignSystemGenerator()
+        categories = {}
+        filepath = DATA_DIR / CSV_CONFIG["product"]["file"]
+        if not filepath.exists():
+            return categories
+        with open(filepath, 'r', encoding='utf-8') as f:
+            product_types = [row.get("Product Type") for row in csv.DictReader(f)]
+        for category in product_types:
+            if not category or category in categories:
+                continue
+            reasoning = generator._apply_reasoning(category, {})
+            style_priority = reasoning.get("style_priority", [])
+            # The rule names its landing pattern; category names alone rarely match one
+            landing = generator._search(reasoning.get("pattern", ""), "landing", SEARCH_CONFIG["landing"]["max_results"])
+            known = {"product": {}}
+            if landing.get("results"):
+                known["landing"] = landing
+            results = generator._multi_domain_search(category, style_priority, known=known)
+            style = generator._select_best_match(results["style"].get("results", []), style_priority)
+            categories[category] = {
+                "reasoning": reasoning,
+                "style": [style] if style else [],
+                **{domain: results[domain].get("results", []) for domain in SNAPSHOT_RESULTS if domain != "style"}
+            }
+        return categories
+
+    def _open(self, signature: list) -> bool:
+        """Load the header of a snapshot file built for signature."""
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline())
+                base = f.tell()
+            if header.get("signature") != signature:
+                return False
+            self._offsets, self._row_offsets, self._base = header["offsets"], header["rows"], base
+            return True
+        except (OSError, ValueError, KeyError, AttributeError):
+            return False
+
+    def _read(self, category: str):
+        try:
+            with open(self.path, 'rb') as f:
+                def line(start: int, length: int):
+                    f.seek(self._base + start)
+                    return json.loads(f.read(length))
+
+                skeleton = line(*self._offsets[category])
+                for domain in SNAPSHOT_RESULTS:
+                    for i, row_id in enumerate(skeleton[domain]):
+                        if row_id not in self._rows:
+                            self._rows[row_id] = line(*self._row_offsets[row_id])
+                        skeleton[domain][i] = self._rows[row_id]
+                return skeleton
+        except (OSError, ValueError, KeyError, IndexError, TypeError):
+            return None
+
+    def _write(self, signature: list, categories: dict):
+        def encode(value) -> bytes:
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode('utf-8') + b"\n"
+
+        row_lines, row_ids = [], {}
+        category_lines = []
+        for skeleton in categories.values():
+            packed = dict(skeleton)
+            for domain in SNAPSHOT_RESULTS:
+                ids = []
+                for row in skeleton[domain]:
+                    line = encode(row)
+                    if line not in row_ids:
+                        row_ids[line] = len(row_lines)
+                        row_lines.append(line)
+                    ids.append(row_ids[line])
+                packed[domain] = ids
+            category_lines.append(encode(packed))
+
+        pos = 0
+        rows = []
+        for line in row_lines:
+            rows.append([pos, len(line)])
+            pos += len(line)
+        offsets = {}
+        for category, line in zip(categories, category_lines):
+            offsets[category] = [pos, len(line)]
+            pos += len(line)
+        header = encode({"signature": signature, "rows": rows, "offsets": offsets})
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(header)
+                    f.writelines(row_lines)
+                    f.writelines(category_lines)
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            pass  # read-only skill directory: keep the skeletons in memory only
+
+
+_default_snapshots = None
+
+
+def default_snapshots() -> CategorySnapshots:
+    """Process-wide CategorySnapshots over the bundled data."""
+    global _default_snapshots
+    if _default_snapshots is None:
+        _default_snapshots = CategorySnapshots()
+    return _default_snapshots
+
 
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
     """Generates design system recommendations from aggregated searches."""
 
-    def __init__(self):
-        self.reasoning_data = self._load_reasoning()
+    def __init__(self, fanout: SearchFanout = None, snapshots: CategorySnapshots = None):
+        self._reasoning_data = None
+        self._reasoning_index = None
+        self._fanout = fanout  # None: run searches one after another
+        self._snapshots = snapshots  # None: resolve every domain from the query
+
+    @property
+    def reasoning_data(self) -> list:
+        """Reasoning rules, read from CSV on first use."""
+        if self._reasoning_data is None:
+            self._reasoning_data = self._load_reasoning()
+        return self._reasoning_data
+
+    @property
+    def reasoning_index(self) -> ReasoningIndex:
+        """Lookup index over reasoning_data, built on first use."""
+        if self._reasoning_index is None:
+            self._reasoning_index = ReasoningIndex(self.reasoning_data)
+        return self._reasoning_index
 
     def _load_reasoning(self) -> list:
         """Load reasoning rules from CSV."""
@@ -48,48 +416,37 @@ class DesignSystemGenerator:
         with open(filepath, 'r', encoding='utf-8') as f:
             return list(csv.DictReader(f))
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+    def _search(self, query: str, domain: str, max_results: int) -> dict:
+        """Run one domain search, through the fanout when there is one."""
+        if self._fanout is None:
+            return search(query, domain, max_results)
+        return self._fanout.search(query, domain, max_results)
+
+    def _multi_domain_search(self, query: str, style_priority: list = None, known: dict = None) -> dict:
+        """Execute searches across multiple domains, reusing results already in `known`."""
+        results = dict(known or {})
         for domain, config in SEARCH_CONFIG.items():
+            if domain in results:
+                continue
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                results[domain] = self._search(combined_query, domain, config["max_results"])
             else:
-                results[domain] = search(query, domain, config["max_results"])
+                results[domain] = self._search(query, domain, config["max_results"])
         return results
 
     def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
-        category_lower = category.lower()
-
-        # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
-
-        # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
-
-        # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
-
-        return {}
+        """Find matching reasoning rule for a category (exact, then partial, then keyword match)."""
+        idx = self.reasoning_index.find(category)
+        return self.reasoning_data[idx] if idx is not None else {}
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
-        rule = self._find_reasoning_rule(category)
+        idx = self.reasoning_index.find(category)
 
-        if not rule:
+        if idx is None:
             return {
                 "pattern": "Hero + Features + CTA",
                 "style_priority": ["Minimalism", "Flat Design"],
@@ -101,23 +458,7 @@ class DesignSystemGenerator:
                 "severity": "MEDIUM"
             }
 
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
-
-        return {
-            "pattern": rule.get("Recommended_Pattern", ""),
-            "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
-            "color_mood": rule.get("Color_Mood", ""),
-            "typography_mood": rule.get("Typography_Mood", ""),
-            "key_effects": rule.get("Key_Effects", ""),
-            "anti_patterns": rule.get("Anti_Patterns", ""),
-            "decision_rules": decision_rules,
-            "severity": rule.get("Severity", "MEDIUM")
-        }
+        return self.reasoning_index.reasoning(idx)
 
     def _select_best_match(self, results: list, priority_keywords: list) -> dict:
         """Select best matching result based on priority keywords."""
@@ -162,26 +503,42 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
+        # Every domain but style needs only the query: start them all alongside product,
+        # so only the style search waits for the product -> reasoning step
+        if self._fanout is not None:
+            for domain, config in SEARCH_CONFIG.items():
+                if domain != "style" and not (self._snapshots and domain in SNAPSHOT_DOMAINS):
+                    self._fanout.submit(query, domain, config["max_results"])
+
         # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        product_result = self._search(query, "product", SEARCH_CONFIG["product"]["max_results"])
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
             category = product_results[0].get("Product Type", "General")
 
-        # Step 2: Get reasoning rules for this category
-        reasoning = self._apply_reasoning(category, {})
+        # Step 2: Get reasoning rules for this category (precomputed with snapshots)
+        known = {"product": product_result}
+        skeleton = self._snapshots.get(category) if self._snapshots is not None else None
+        if skeleton is None:
+            reasoning = self._apply_reasoning(category, {})
+        else:
+            reasoning = skeleton["reasoning"]
+            known.update({domain: {"results": skeleton[domain]} for domain in SNAPSHOT_DOMAINS})
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
+        search_results = self._multi_domain_search(query, style_priority, known=known)
 
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
         color_results = self._extract_results(search_results.get("color", {}))
         typography_results = self._extract_results(search_results.get("typography", {}))
         landing_results = self._extract_results(search_results.get("landing", {}))
+        if skeleton is not None:
+            # Query-specific hits win; the category's own fill in where the query finds nothing
+            style_results = style_results or skeleton["style"]
+            typography_results = typography_results or skeleton["typography"]
 
         best_style = self._select_best_match(style_results, reasoning.get("style_priority", []))
         best_color = color_results[0] if color_results else {}
@@ -189,6 +546,7 @@ class DesignSystemGenerator:
         best_landing = landing_results[0] if landing_results else {}
 
         # Step 5: Build final recommendation
+        import contrast  # imported on first use, not with this module
         # Combine effects from both reasoning and style search
         style_effects = best_style.get("Effects & Animation", "")
         reasoning_effects = reasoning.get("key_effects", "")
@@ -231,6 +589,8 @@ class DesignSystemGenerator:
                 "cta": best_color.get("Accent", "#F97316"),
                 "text": best_color.get("Foreground", "#1E293B"),
             },
+            # Palette pairs below their WCAG minimum (contrast.PAIRS)
+            "contrast": contrast.failures(contrast.default_index().check(best_color)) if best_color else [],
             "typography": {
                 "heading": best_typography.get("Heading Font", "Inter"),
                 "body": best_typography.get("Body Font", "Inter"),
@@ -249,6 +609,22 @@ class DesignSystemGenerator:
 # ============ OUTPUT FORMATTERS ============
 BOX_WIDTH = 90  # Wider box for more content
 
+_ANSI_ESCAPE = re.compile(r'\033\[[0-9;]*m')
+
+# (label, design_system["colors"] key, CSS variable), in palette order
+COLOR_ENTRIES = [
+    ("Primary",      "primary",      "--color-primary"),
+    ("On Primary",   "on_primary",   "--color-on-primary"),
+    ("Secondary",    "secondary",    "--color-secondary"),
+    ("Accent/CTA",   "accent",       "--color-accent"),
+    ("Background",   "background",   "--color-background"),
+    ("Foreground",   "foreground",   "--color-foreground"),
+    ("Muted",        "muted",        "--color-muted"),
+    ("Border",       "border",       "--color-border"),
+    ("Destructive",  "destructive",  "--color-destructive"),
+    ("Ring",         "ring",         "--color-ring"),
+]
+
 
 def hex_to_ansi(hex_color: str) -> str:
     """Convert hex color to ANSI True Color swatch (██) with fallback."""
@@ -266,8 +642,7 @@ def hex_to_ansi(hex_color: str) -> str:
 
 def ansi_ljust(s: str, width: int) -> str:
     """Like str.ljust but accounts for zero-width ANSI escape sequences."""
-    import re
-    visible_len = len(re.sub(r'\033\[[0-9;]*m', '', s))
+    visible_len = len(_ANSI_ESCAPE.sub('', s))
     pad = width - visible_len
     return s + (" " * max(0, pad))
 
@@ -279,7 +654,44 @@ def section_header(name: str, width: int) -> str:
     return f"├{label}{fill}┤"
 
 
-def format_ascii_box(design_system: dict) -> str:
+def _wrap_text(text: str, prefix: str, width: int) -> list:
+    """Wrap long text into multiple lines (greedy, each line starts with prefix)."""
+    lines = []
+    words = []
+    length = len(prefix)  # of prefix + " ".join(words)
+    for word in text.split():
+        if length + len(word) + 1 <= width - 2:
+            length += len(word) + (1 if words else 0)
+            words.append(word)
+        else:
+            if words:
+                lines.append(prefix + " ".join(words))
+            words = [word]
+            length = len(prefix) + len(word)
+    if words:
+        lines.append(prefix + " ".join(words))
+    return lines
+
+
+# Fixed parts of the ASCII box, built once
+_BOX_RULE = "═" * (BOX_WIDTH - 1)
+_BOX_TOP = "╔" + _BOX_RULE + "╗"
+_BOX_TITLE_END = "╚" + _BOX_RULE + "╝\n┌" + "─" * (BOX_WIDTH - 1) + "┐"
+_BOX_BOTTOM = "└" + "─" * (BOX_WIDTH - 1) + "┘"
+_BOX_SECTIONS = {name: section_header(name, BOX_WIDTH + 1)
+                 for name in ("PATTERN", "STYLE", "COLORS", "TYPOGRAPHY", "KEY EFFECTS", "AVOID", "PRE-DELIVERY CHECKLIST")}
+_BOX_CHECKLIST = [f"│     {item}".ljust(BOX_WIDTH) + "│" for item in (
+    "[ ] No emojis as icons (use SVG: Heroicons/Lucide)",
+    "[ ] cursor-pointer on all clickable elements",
+    "[ ] Hover states with smooth transitions (150-300ms)",
+    "[ ] Light mode: text contrast 4.5:1 minimum",
+    "[ ] Focus states visible for keyboard nav",
+    "[ ] prefers-reduced-motion respected",
+    "[ ] Responsive: 375px, 768px, 1024px, 1440px"
+)]
+
+
+def format_ascii_box(design_system: dict, contrast_warnings: bool = False) -> str:
     """Format design system as Unicode box with ANSI color swatches."""
     project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
@@ -289,139 +701,105 @@ def format_ascii_box(design_system: dict) -> str:
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
 
-    def wrap_text(text: str, prefix: str, width: int) -> list:
-        """Wrap long text into multiple lines."""
-        if not text:
-            return []
-        words = text.split()
-        lines = []
-        current_line = prefix
-        for word in words:
-            if len(current_line) + len(word) + 1 <= width - 2:
-                current_line += (" " if current_line != prefix else "") + word
-            else:
-                if current_line != prefix:
-                    lines.append(current_line)
-                current_line = prefix + word
-        if current_line != prefix:
-            lines.append(current_line)
-        return lines
+    def row(text: str) -> str:
+        return text.ljust(BOX_WIDTH) + "│"
+
+    def wrapped(text: str) -> list:
+        return [row(line) for line in _wrap_text(text, "│     ", BOX_WIDTH)]
 
     # Build sections from pattern
     sections = pattern.get("sections", "").split(">")
     sections = [s.strip() for s in sections if s.strip()]
 
-    # Build output lines
-    lines = []
-    w = BOX_WIDTH - 1
-
     # Header with double-line box
-    lines.append("╔" + "═" * w + "╗")
-    lines.append(ansi_ljust(f"║  TARGET: {project} - RECOMMENDED DESIGN SYSTEM", BOX_WIDTH) + "║")
-    lines.append("╚" + "═" * w + "╝")
-    lines.append("┌" + "─" * w + "┐")
+    lines = [_BOX_TOP, ansi_ljust(f"║  TARGET: {project} - RECOMMENDED DESIGN SYSTEM", BOX_WIDTH) + "║", _BOX_TITLE_END]
 
     # Pattern section
-    lines.append(section_header("PATTERN", BOX_WIDTH + 1))
-    lines.append(f"│  Name: {pattern.get('name', '')}".ljust(BOX_WIDTH) + "│")
+    lines.append(_BOX_SECTIONS["PATTERN"])
+    lines.append(row(f"│  Name: {pattern.get('name', '')}"))
     if pattern.get('conversion'):
-        lines.append(f"│     Conversion: {pattern.get('conversion', '')}".ljust(BOX_WIDTH) + "│")
+        lines.append(row(f"│     Conversion: {pattern.get('conversion', '')}"))
     if pattern.get('cta_placement'):
-        lines.append(f"│     CTA: {pattern.get('cta_placement', '')}".ljust(BOX_WIDTH) + "│")
-    lines.append("│     Sections:".ljust(BOX_WIDTH) + "│")
-    for i, section in enumerate(sections, 1):
-        lines.append(f"│       {i}. {section}".ljust(BOX_WIDTH) + "│")
+        lines.append(row(f"│     CTA: {pattern.get('cta_placement', '')}"))
+    lines.append(row("│     Sections:"))
+    lines.extend(row(f"│       {i}. {section}") for i, section in enumerate(sections, 1))
 
     # Style section
-    lines.append(section_header("STYLE", BOX_WIDTH + 1))
-    lines.append(f"│  Name: {style.get('name', '')}".ljust(BOX_WIDTH) + "│")
+    lines.append(_BOX_SECTIONS["STYLE"])
+    lines.append(row(f"│  Name: {style.get('name', '')}"))
     light = style.get("light_mode", "")
     dark = style.get("dark_mode", "")
     if light or dark:
-        lines.append(f"│     Mode Support: Light {light}  Dark {dark}".ljust(BOX_WIDTH) + "│")
+        lines.append(row(f"│     Mode Support: Light {light}  Dark {dark}"))
     if style.get("keywords"):
-        for line in wrap_text(f"Keywords: {style.get('keywords', '')}", "│     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "│")
+        lines.extend(wrapped(f"Keywords: {style.get('keywords', '')}"))
     if style.get("best_for"):
-        for line in wrap_text(f"Best For: {style.get('best_for', '')}", "│     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "│")
+        lines.extend(wrapped(f"Best For: {style.get('best_for', '')}"))
     if style.get("performance") or style.get("accessibility"):
-        perf_a11y = f"Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}"
-        lines.append(f"│     {perf_a11y}".ljust(BOX_WIDTH) + "│")
-
-    # Colors section (extended palette with ANSI swatches)
-    lines.append(section_header("COLORS", BOX_WIDTH + 1))
-    color_entries = [
-        ("Primary",      "primary",      "--color-primary"),
-        ("On Primary",   "on_primary",   "--color-on-primary"),
-        ("Secondary",    "secondary",    "--color-secondary"),
-        ("Accent/CTA",   "accent",       "--color-accent"),
-        ("Background",   "background",   "--color-background"),
-        ("Foreground",   "foreground",   "--color-foreground"),
-        ("Muted",        "muted",        "--color-muted"),
-        ("Border",       "border",       "--color-border"),
-        ("Destructive",  "destructive",  "--color-destructive"),
-        ("Ring",         "ring",         "--color-ring"),
-    ]
-    for label, key, css_var in color_entries:
+        lines.append(row(f"│     Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}"))
+
+    # Colors section (extended palette with ANSI swatches, when the terminal has true color)
+    lines.append(_BOX_SECTIONS["COLORS"])
+    truecolor = os.environ.get('COLORTERM', '') in ('truecolor', '24bit')
+    for label, key, css_var in COLOR_ENTRIES:
         hex_val = colors.get(key, "")
         if not hex_val:
             continue
-        swatch = hex_to_ansi(hex_val)
+        swatch = hex_to_ansi(hex_val) if truecolor else ""
         content = f"│     {swatch}{label + ':':14s} {hex_val:10s} ({css_var})"
-        lines.append(ansi_ljust(content, BOX_WIDTH) + "│")
+        lines.append(ansi_ljust(content, BOX_WIDTH) + "│" if swatch else row(content))
     if colors.get("notes"):
-        for line in wrap_text(f"Notes: {colors.get('notes', '')}", "│     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "│")
+        lines.extend(wrapped(f"Notes: {colors.get('notes', '')}"))
+    warning = _contrast_warning(design_system) if contrast_warnings else ""
+    if warning:
+        lines.extend(wrapped(f"Contrast below WCAG AA: {warning}"))
 
     # Typography section
-    lines.append(section_header("TYPOGRAPHY", BOX_WIDTH + 1))
-    lines.append(f"│  {typography.get('heading', '')} / {typography.get('body', '')}".ljust(BOX_WIDTH) + "│")
+    lines.append(_BOX_SECTIONS["TYPOGRAPHY"])
+    lines.append(row(f"│  {typography.get('heading', '')} / {typography.get('body', '')}"))
     if typography.get("mood"):
-        for line in wrap_text(f"Mood: {typography.get('mood', '')}", "│     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "│")
+        lines.extend(wrapped(f"Mood: {typography.get('mood', '')}"))
     if typography.get("best_for"):
-        for line in wrap_text(f"Best For: {typography.get('best_for', '')}", "│     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "│")
+        lines.extend(wrapped(f"Best For: {typography.get('best_for', '')}"))
     if typography.get("google_fonts_url"):
-        lines.append(f"│     Google Fonts: {typography.get('google_fonts_url', '')}".ljust(BOX_WIDTH) + "│")
+        lines.append(row(f"│     Google Fonts: {typography.get('google_fonts_url', '')}"))
     if typography.get("css_import"):
-        lines.append(f"│     CSS Import: {typography.get('css_import', '')[:70]}...".ljust(BOX_WIDTH) + "│")
+        lines.append(row(f"│     CSS Import: {typography.get('css_import', '')[:70]}..."))
 
     # Key Effects section
     if effects:
-        lines.append(section_header("KEY EFFECTS", BOX_WIDTH + 1))
-        for line in wrap_text(effects, "│     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "│")
+        lines.append(_BOX_SECTIONS["KEY EFFECTS"])
+        lines.extend(wrapped(effects))
 
     # Anti-patterns section
     if anti_patterns:
-        lines.append(section_header("AVOID", BOX_WIDTH + 1))
-        for line in wrap_text(anti_patterns, "│     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "│")
+        lines.append(_BOX_SECTIONS["AVOID"])
+        lines.extend(wrapped(anti_patterns))
 
     # Pre-Delivery Checklist section
-    lines.append(section_header("PRE-DELIVERY CHECKLIST", BOX_WIDTH + 1))
-    checklist_items = [
-        "[ ] No emojis as icons (use SVG: Heroicons/Lucide)",
-        "[ ] cursor-pointer on all clickable elements",
-        "[ ] Hover states with smooth transitions (150-300ms)",
-        "[ ] Light mode: text contrast 4.5:1 minimum",
-        "[ ] Focus states visible for keyboard nav",
-        "[ ] prefers-reduced-motion respected",
-        "[ ] Responsive: 375px, 768px, 1024px, 1440px"
-    ]
-    for item in checklist_items:
-        lines.append(f"│     {item}".ljust(BOX_WIDTH) + "│")
-
-    lines.append("└" + "─" * w + "┘")
+    lines.append(_BOX_SECTIONS["PRE-DELIVERY CHECKLIST"])
+    lines.extend(_BOX_CHECKLIST)
+    lines.append(_BOX_BOTTOM)
 
     return "\n".join(lines)
 
 
-def format_markdown(design_system: dict) -> str:
+def _contrast_warning(design_system: dict) -> str:
+    """The palette's failing contrast pairs on one line, or '' when all pass."""
+    return "; ".join(
+        f"{pair['fg']} on {pair['bg']} {pair['ratio']}:1 (min {pair['min']}:1)"
+        + (f", use {pair['suggest']}" if pair.get("suggest") else "")
+        for pair in design_system.get("contrast") or []
+    )
+
+
+def _color_rows(colors: dict) -> list:
+    """Markdown table rows for the palette roles that have a value."""
+    return [f"| {label} | `{colors[key]}` | `{css_var}` |" for label, key, css_var in COLOR_ENTRIES if colors.get(key)]
+
+
+def format_markdown(design_system: dict, contrast_warnings: bool = False) -> str:
     """Format design system as markdown."""
-    project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
     colors = design_system.get("colors", {})
@@ -429,108 +807,64 @@ def format_markdown(design_system: dict) -> str:
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
 
-    lines = []
-    lines.append(f"## Design System: {project}")
-    lines.append("")
-
-    # Pattern section
-    lines.append("### Pattern")
-    lines.append(f"- **Name:** {pattern.get('name', '')}")
+    pattern_details = []
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Focus:** {pattern.get('conversion', '')}")
+        pattern_details.append(f"- **Conversion Focus:** {pattern['conversion']}")
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
+        pattern_details.append(f"- **CTA Placement:** {pattern['cta_placement']}")
     if pattern.get('color_strategy'):
-        lines.append(f"- **Color Strategy:** {pattern.get('color_strategy', '')}")
-    lines.append(f"- **Sections:** {pattern.get('sections', '')}")
-    lines.append("")
+        pattern_details.append(f"- **Color Strategy:** {pattern['color_strategy']}")
 
-    # Style section
-    lines.append("### Style")
-    lines.append(f"- **Name:** {style.get('name', '')}")
+    style_details = []
     light = style.get("light_mode", "")
     dark = style.get("dark_mode", "")
     if light or dark:
-        lines.append(f"- **Mode Support:** Light {light} | Dark {dark}")
+        style_details.append(f"- **Mode Support:** Light {light} | Dark {dark}")
     if style.get('keywords'):
-        lines.append(f"- **Keywords:** {style.get('keywords', '')}")
+        style_details.append(f"- **Keywords:** {style['keywords']}")
     if style.get('best_for'):
-        lines.append(f"- **Best For:** {style.get('best_for', '')}")
+        style_details.append(f"- **Best For:** {style['best_for']}")
     if style.get('performance') or style.get('accessibility'):
-        lines.append(f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}")
-    lines.append("")
-
-    # Colors section (extended palette)
-    lines.append("### Colors")
-    lines.append("| Role | Hex | CSS Variable |")
-    lines.append("|------|-----|--------------|")
-    md_color_entries = [
-        ("Primary",      "primary",      "--color-primary"),
-        ("On Primary",   "on_primary",   "--color-on-primary"),
-        ("Secondary",    "secondary",    "--color-secondary"),
-        ("Accent/CTA",   "accent",       "--color-accent"),
-        ("Background",   "background",   "--color-background"),
-        ("Foreground",   "foreground",   "--color-foreground"),
-        ("Muted",        "muted",        "--color-muted"),
-        ("Border",       "border",       "--color-border"),
-        ("Destructive",  "destructive",  "--color-destructive"),
-        ("Ring",         "ring",         "--color-ring"),
-    ]
-    for label, key, css_var in md_color_entries:
-        hex_val = colors.get(key, "")
-        if hex_val:
-            lines.append(f"| {label} | `{hex_val}` | `{css_var}` |")
+        style_details.append(f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}")
+
+    color_rows = _color_rows(colors)
     if colors.get("notes"):
-        lines.append(f"\n*Notes: {colors.get('notes', '')}*")
-    lines.append("")
+        color_rows += ["", f"*Notes: {colors['notes']}*"]
+    warning = _contrast_warning(design_system) if contrast_warnings else ""
+    if warning:
+        color_rows += ["", f"*Contrast below WCAG AA: {warning}*"]
 
-    # Typography section
-    lines.append("### Typography")
-    lines.append(f"- **Heading:** {typography.get('heading', '')}")
-    lines.append(f"- **Body:** {typography.get('body', '')}")
+    typography_details = []
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        typography_details.append(f"- **Mood:** {typography['mood']}")
     if typography.get("best_for"):
-        lines.append(f"- **Best For:** {typography.get('best_for', '')}")
+        typography_details.append(f"- **Best For:** {typography['best_for']}")
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** {typography.get('google_fonts_url', '')}")
+        typography_details.append(f"- **Google Fonts:** {typography['google_fonts_url']}")
     if typography.get("css_import"):
-        lines.append(f"- **CSS Import:**")
-        lines.append(f"```css")
-        lines.append(f"{typography.get('css_import', '')}")
-        lines.append(f"```")
-    lines.append("")
-
-    # Key Effects section
-    if effects:
-        lines.append("### Key Effects")
-        lines.append(f"{effects}")
-        lines.append("")
-
-    # Anti-patterns section
-    if anti_patterns:
-        lines.append("### Avoid (Anti-patterns)")
-        newline_bullet = '\n- '
-        lines.append(f"- {anti_patterns.replace(' + ', newline_bullet)}")
-        lines.append("")
-
-    # Pre-Delivery Checklist section
-    lines.append("### Pre-Delivery Checklist")
-    lines.append("- [ ] No emojis as icons (use SVG: Heroicons/Lucide)")
-    lines.append("- [ ] cursor-pointer on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard nav")
-    lines.append("- [ ] prefers-reduced-motion respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("")
-
-    return "\n".join(lines)
+        typography_details += ["- **CSS Import:**", "```css", typography["css_import"], "```"]
+
+    return templates.DESIGN_SYSTEM_MD.render(
+        project=design_system.get("project_name", "PROJECT"),
+        pattern_name=pattern.get('name', ''),
+        pattern_details=pattern_details,
+        sections=pattern.get('sections', ''),
+        style_name=style.get('name', ''),
+        style_details=style_details,
+        color_rows=color_rows,
+        heading=typography.get('heading', ''),
+        body=typography.get('body', ''),
+        typography_details=typography_details,
+        effects=["### Key Effects", effects, ""] if effects else [],
+        anti_patterns=["### Avoid (Anti-patterns)", "- " + anti_patterns.replace(" + ", "\n- "), ""] if anti_patterns else [],
+    )
 
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           parallel: bool = False, snapshot: bool = False,
+                           contrast_warnings: bool = False) -> str:
     """
     Main entry point for design system generation.
 
@@ -541,24 +875,40 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        parallel: If True, run the independent domain searches on a thread pool
+        snapshot: If True, start from the precomputed skeleton of the matched
+            product type (see CategorySnapshots) instead of searching every domain
+        contrast_warnings: If True, list the palette's pairs below their WCAG
+            minimum in the output (and MASTER.md)
 
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    snapshots = default_snapshots() if snapshot else None
+    if parallel:
+        with SearchFanout() as fanout:
+            if persist and page:
+                # The page-override searches depend only on page + query; leaving the
+                # block waits for them, so persisting below finds them in core's cache
+                context = _page_context(page, query)
+                for domain, config in OVERRIDE_SEARCH_CONFIG.items():
+                    fanout.submit(context, domain, config["max_results"])
+            design_system = DesignSystemGenerator(fanout, snapshots).generate(query, project_name)
+    else:
+        design_system = DesignSystemGenerator(snapshots=snapshots).generate(query, project_name)
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        persist_design_system(design_system, page, output_dir, query, contrast_warnings)
 
     if output_format == "markdown":
-        return format_markdown(design_system)
-    return format_ascii_box(design_system)
+        return format_markdown(design_system, contrast_warnings)
+    return format_ascii_box(design_system, contrast_warnings)
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          contrast_warnings: bool = False) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
@@ -567,429 +917,197 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        contrast_warnings: List failing WCAG contrast pairs in MASTER.md
     
+    Files whose content is unchanged (ignoring the Generated timestamp) are
+    left untouched; new and changed files are written atomically.
+
     Returns:
-        dict with created file paths and status
+        dict with status, the persisted file paths ("created_files", all of
+        them) and their split into "created", "updated" and "unchanged"
     """
-    base_dir = Path(output_dir) if output_dir else Path.cwd()
-    
-    # Use project name for project-specific folder
-    project_name = design_system.get("project_name", "default")
-    project_slug = project_name.lower().replace(' ', '-')
-    
-    design_system_dir = base_dir / "design-system" / project_slug
-    pages_dir = design_system_dir / "pages"
-    
-    created_files = []
-    
-    # Create directories
-    design_system_dir.mkdir(parents=True, exist_ok=True)
-    pages_dir.mkdir(parents=True, exist_ok=True)
-    
-    master_file = design_system_dir / "MASTER.md"
-    
-    # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
+    design_system_dir = _design_system_dir(design_system, output_dir)
+    written = [_write_master(design_system_dir, design_system, contrast_warnings)]
     
     # If page is specified, create page override file with intelligent content
     if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
+        written.append(_write_page_override(design_system_dir, design_system, page, page_query))
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": [str(path) for path, _ in written],
+        **_write_summary(written)
     }
 
 
-def format_master_md(design_system: dict) -> str:
+def _design_system_dir(design_system: dict, output_dir: str = None) -> Path:
+    """design-system/<project-slug>/ under output_dir (default: current working directory)."""
+    base_dir = Path(output_dir) if output_dir else Path.cwd()
+    return base_dir / "design-system" / _slug(design_system.get("project_name", "default"))
+
+
+def _slug(name: str) -> str:
+    """File/folder name for a project or page name."""
+    return name.lower().replace(' ', '-')
+
+
+# The only line that differs between two renders of the same design system
+_GENERATED_LINE = re.compile(r"^(?:> )?\*\*Generated:\*\* .*$", re.M)
+
+
+def _content_hash(text: str) -> str:
+    """sha256 of a document with its Generated timestamp blanked out."""
+    return hashlib.sha256(_GENERATED_LINE.sub("", text).encode('utf-8')).hexdigest()
+
+
+def _write_if_changed(path: Path, content: str) -> str:
+    """
+    Write content to path unless the file already holds the same document.
+
+    The comparison is by _content_hash, so a new timestamp alone is not a
+    change. Writes go to a temporary file in the same folder that is then
+    renamed over path, so readers never see a half-written file.
+
+    Returns:
+        "created", "updated" or "unchanged"
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            existing = f.read()
+    except FileNotFoundError:
+        status, mode = "created", None
+    except (OSError, UnicodeDecodeError):
+        status, mode = "updated", None
+    else:
+        if _content_hash(existing) == _content_hash(content):
+            return "unchanged"
+        status, mode = "updated", os.stat(path).st_mode & 0o777
+
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)  # umask applies, as for open()
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return status
+
+
+def _write_summary(written: list) -> dict:
+    """Group (path, status) pairs into created / updated / unchanged path lists."""
+    summary = {"created": [], "updated": [], "unchanged": []}
+    for path, status in written:
+        summary[status].append(str(path))
+    return summary
+
+
+def _write_master(design_system_dir: Path, design_system: dict, contrast_warnings: bool = False) -> tuple:
+    """Write MASTER.md if it changed (creating the project and pages/ folders); returns (path, status)."""
+    (design_system_dir / "pages").mkdir(parents=True, exist_ok=True)
+    master_file = design_system_dir / "MASTER.md"
+    return master_file, _write_if_changed(master_file, format_master_md(design_system, contrast_warnings))
+
+
+def _write_page_override(design_system_dir: Path, design_system: dict, page: str, page_query: str = None) -> tuple:
+    """Write pages/<page-slug>.md if it changed; returns (path, status)."""
+    page_file = design_system_dir / "pages" / f"{_slug(page)}.md"
+    return page_file, _write_if_changed(page_file, format_page_override_md(design_system, page, page_query))
+
+
+def format_master_md(design_system: dict, contrast_warnings: bool = False) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
-    project = design_system.get("project_name", "PROJECT")
     pattern = design_system.get("pattern", {})
     style = design_system.get("style", {})
     colors = design_system.get("colors", {})
     typography = design_system.get("typography", {})
     effects = design_system.get("key_effects", "")
     anti_patterns = design_system.get("anti_patterns", "")
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    lines = []
-    
-    # Logic header
-    lines.append("# Design System Master File")
-    lines.append("")
-    lines.append("> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.")
-    lines.append("> If that file exists, its rules **override** this Master file.")
-    lines.append("> If not, strictly follow the rules below.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append(f"**Project:** {project}")
-    lines.append(f"**Generated:** {timestamp}")
-    lines.append(f"**Category:** {design_system.get('category', 'General')}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    
-    # Global Rules section
-    lines.append("## Global Rules")
-    lines.append("")
-    
-    # Color Palette
-    lines.append("### Color Palette")
-    lines.append("")
-    lines.append("| Role | Hex | CSS Variable |")
-    lines.append("|------|-----|--------------|")
-    master_color_entries = [
-        ("Primary",      "primary",      "--color-primary"),
-        ("On Primary",   "on_primary",   "--color-on-primary"),
-        ("Secondary",    "secondary",    "--color-secondary"),
-        ("Accent/CTA",   "accent",       "--color-accent"),
-        ("Background",   "background",   "--color-background"),
-        ("Foreground",   "foreground",   "--color-foreground"),
-        ("Muted",        "muted",        "--color-muted"),
-        ("Border",       "border",       "--color-border"),
-        ("Destructive",  "destructive",  "--color-destructive"),
-        ("Ring",         "ring",         "--color-ring"),
-    ]
-    for label, key, css_var in master_color_entries:
-        hex_val = colors.get(key, "")
-        if hex_val:
-            lines.append(f"| {label} | `{hex_val}` | `{css_var}` |")
-    lines.append("")
-    if colors.get("notes"):
-        lines.append(f"**Color Notes:** {colors.get('notes', '')}")
-        lines.append("")
-    
-    # Typography
-    lines.append("### Typography")
-    lines.append("")
-    lines.append(f"- **Heading Font:** {typography.get('heading', 'Inter')}")
-    lines.append(f"- **Body Font:** {typography.get('body', 'Inter')}")
+
+    typography_details = []
     if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
+        typography_details.append(f"- **Mood:** {typography['mood']}")
     if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})")
-    lines.append("")
-    if typography.get("css_import"):
-        lines.append("**CSS Import:**")
-        lines.append("```css")
-        lines.append(typography.get("css_import", ""))
-        lines.append("```")
-        lines.append("")
-    
-    # Spacing Variables
-    lines.append("### Spacing Variables")
-    lines.append("")
-    lines.append("| Token | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--space-xs` | `4px` / `0.25rem` | Tight gaps |")
-    lines.append("| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |")
-    lines.append("| `--space-md` | `16px` / `1rem` | Standard padding |")
-    lines.append("| `--space-lg` | `24px` / `1.5rem` | Section padding |")
-    lines.append("| `--space-xl` | `32px` / `2rem` | Large gaps |")
-    lines.append("| `--space-2xl` | `48px` / `3rem` | Section margins |")
-    lines.append("| `--space-3xl` | `64px` / `4rem` | Hero padding |")
-    lines.append("")
-    
-    # Shadow Depths
-    lines.append("### Shadow Depths")
-    lines.append("")
-    lines.append("| Level | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |")
-    lines.append("| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |")
-    lines.append("| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |")
-    lines.append("| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |")
-    lines.append("")
-    
-    # Component Specs section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Component Specs")
-    lines.append("")
-    
-    # Buttons
-    lines.append("### Buttons")
-    lines.append("")
-    lines.append("```css")
-    lines.append("/* Primary Button */")
-    lines.append(".btn-primary {")
-    lines.append(f"  background: {colors.get('cta', '#F97316')};")
-    lines.append("  color: white;")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".btn-primary:hover {")
-    lines.append("  opacity: 0.9;")
-    lines.append("  transform: translateY(-1px);")
-    lines.append("}")
-    lines.append("")
-    lines.append("/* Secondary Button */")
-    lines.append(".btn-secondary {")
-    lines.append(f"  background: transparent;")
-    lines.append(f"  color: {colors.get('primary', '#2563EB')};")
-    lines.append(f"  border: 2px solid {colors.get('primary', '#2563EB')};")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Cards
-    lines.append("### Cards")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".card {")
-    lines.append(f"  background: {colors.get('background', '#FFFFFF')};")
-    lines.append("  border-radius: 12px;")
-    lines.append("  padding: 24px;")
-    lines.append("  box-shadow: var(--shadow-md);")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".card:hover {")
-    lines.append("  box-shadow: var(--shadow-lg);")
-    lines.append("  transform: translateY(-2px);")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Inputs
-    lines.append("### Inputs")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".input {")
-    lines.append("  padding: 12px 16px;")
-    lines.append("  border: 1px solid #E2E8F0;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-size: 16px;")
-    lines.append("  transition: border-color 200ms ease;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".input:focus {")
-    lines.append(f"  border-color: {colors.get('primary', '#2563EB')};")
-    lines.append("  outline: none;")
-    lines.append(f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Modals
-    lines.append("### Modals")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".modal-overlay {")
-    lines.append("  background: rgba(0, 0, 0, 0.5);")
-    lines.append("  backdrop-filter: blur(4px);")
-    lines.append("}")
-    lines.append("")
-    lines.append(".modal {")
-    lines.append("  background: white;")
-    lines.append("  border-radius: 16px;")
-    lines.append("  padding: 32px;")
-    lines.append("  box-shadow: var(--shadow-xl);")
-    lines.append("  max-width: 500px;")
-    lines.append("  width: 90%;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Style section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Style Guidelines")
-    lines.append("")
-    lines.append(f"**Style:** {style.get('name', 'Minimalism')}")
-    lines.append("")
+        typography_details.append(f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography['google_fonts_url']})")
+
+    style_details = []
     if style.get("keywords"):
-        lines.append(f"**Keywords:** {style.get('keywords', '')}")
-        lines.append("")
+        style_details += [f"**Keywords:** {style['keywords']}", ""]
     if style.get("best_for"):
-        lines.append(f"**Best For:** {style.get('best_for', '')}")
-        lines.append("")
+        style_details += [f"**Best For:** {style['best_for']}", ""]
     if effects:
-        lines.append(f"**Key Effects:** {effects}")
-        lines.append("")
-    
-    # Layout Pattern
-    lines.append("### Page Pattern")
-    lines.append("")
-    lines.append(f"**Pattern Name:** {pattern.get('name', '')}")
-    lines.append("")
+        style_details += [f"**Key Effects:** {effects}", ""]
+
+    pattern_details = []
     if pattern.get('conversion'):
-        lines.append(f"- **Conversion Strategy:** {pattern.get('conversion', '')}")
+        pattern_details.append(f"- **Conversion Strategy:** {pattern['conversion']}")
     if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
-    lines.append(f"- **Section Order:** {pattern.get('sections', '')}")
-    lines.append("")
-    
-    # Anti-Patterns section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Anti-Patterns (Do NOT Use)")
-    lines.append("")
-    if anti_patterns:
-        anti_list = [a.strip() for a in anti_patterns.split("+")]
-        for anti in anti_list:
-            if anti:
-                lines.append(f"- ❌ {anti}")
-    lines.append("")
-    lines.append("### Additional Forbidden Patterns")
-    lines.append("")
-    lines.append("- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)")
-    lines.append("- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer")
-    lines.append("- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout")
-    lines.append("- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio")
-    lines.append("- ❌ **Instant state changes** — Always use transitions (150-300ms)")
-    lines.append("- ❌ **Invisible focus states** — Focus states must be visible for a11y")
-    lines.append("")
-    
-    # Pre-Delivery Checklist
-    lines.append("---")
-    lines.append("")
-    lines.append("## Pre-Delivery Checklist")
-    lines.append("")
-    lines.append("Before delivering any UI code, verify:")
-    lines.append("")
-    lines.append("- [ ] No emojis used as icons (use SVG instead)")
-    lines.append("- [ ] All icons from consistent icon set (Heroicons/Lucide)")
-    lines.append("- [ ] `cursor-pointer` on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard navigation")
-    lines.append("- [ ] `prefers-reduced-motion` respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("- [ ] No content hidden behind fixed navbars")
-    lines.append("- [ ] No horizontal scroll on mobile")
-    lines.append("")
-    
-    return "\n".join(lines)
+        pattern_details.append(f"- **CTA Placement:** {pattern['cta_placement']}")
+
+    color_notes = [f"**Color Notes:** {colors['notes']}", ""] if colors.get("notes") else []
+    warning = _contrast_warning(design_system) if contrast_warnings else ""
+    if warning:
+        color_notes += [f"**Contrast Warnings (WCAG AA):** {warning}", ""]
+
+    primary = colors.get('primary', '#2563EB')
+    return templates.MASTER_MD.render(
+        project=design_system.get("project_name", "PROJECT"),
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        category=design_system.get('category', 'General'),
+        color_rows=_color_rows(colors),
+        color_notes=color_notes,
+        heading=typography.get('heading', 'Inter'),
+        body=typography.get('body', 'Inter'),
+        typography_details=typography_details,
+        css_import=["**CSS Import:**", "```css", typography["css_import"], "```", ""] if typography.get("css_import") else [],
+        cta=colors.get('cta', '#F97316'),
+        primary=primary,
+        background=colors.get('background', '#FFFFFF'),
+        style_name=style.get('name', 'Minimalism'),
+        style_details=style_details,
+        pattern_name=pattern.get('name', ''),
+        pattern_details=pattern_details,
+        sections=pattern.get('sections', ''),
+        anti_patterns=[f"- ❌ {anti}" for anti in (a.strip() for a in anti_patterns.split("+")) if anti] if anti_patterns else [],
+    )
+
+
+def _override_lines(values, empty: str) -> list:
+    """Bullet lines for a page-override section (dict -> "**key:** value"), or its placeholder."""
+    if not values:
+        return [empty]
+    if isinstance(values, dict):
+        return [f"- **{key}:** {value}" for key, value in values.items()]
+    return [f"- {value}" for value in values]
 
 
 def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
-    project = design_system.get("project_name", "PROJECT")
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    page_title = page_name.replace("-", " ").replace("_", " ").title()
-    
     # Detect page type and generate intelligent overrides
     page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
-    
-    lines = []
-    
-    lines.append(f"# {page_title} Page Overrides")
-    lines.append("")
-    lines.append(f"> **PROJECT:** {project}")
-    lines.append(f"> **Generated:** {timestamp}")
-    lines.append(f"> **Page Type:** {page_overrides.get('page_type', 'General')}")
-    lines.append("")
-    lines.append("> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).")
-    lines.append("> Only deviations from the Master are documented here. For all other rules, refer to the Master.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    
-    # Page-specific rules with actual content
-    lines.append("## Page-Specific Rules")
-    lines.append("")
-    
-    # Layout Overrides
-    lines.append("### Layout Overrides")
-    lines.append("")
-    layout = page_overrides.get("layout", {})
-    if layout:
-        for key, value in layout.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master layout")
-    lines.append("")
-    
-    # Spacing Overrides
-    lines.append("### Spacing Overrides")
-    lines.append("")
-    spacing = page_overrides.get("spacing", {})
-    if spacing:
-        for key, value in spacing.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master spacing")
-    lines.append("")
-    
-    # Typography Overrides
-    lines.append("### Typography Overrides")
-    lines.append("")
-    typography = page_overrides.get("typography", {})
-    if typography:
-        for key, value in typography.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master typography")
-    lines.append("")
-    
-    # Color Overrides
-    lines.append("### Color Overrides")
-    lines.append("")
-    colors = page_overrides.get("colors", {})
-    if colors:
-        for key, value in colors.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master colors")
-    lines.append("")
-    
-    # Component Overrides
-    lines.append("### Component Overrides")
-    lines.append("")
-    components = page_overrides.get("components", [])
-    if components:
-        for comp in components:
-            lines.append(f"- {comp}")
-    else:
-        lines.append("- No overrides — use Master component specs")
-    lines.append("")
-    
-    # Page-Specific Components
-    lines.append("---")
-    lines.append("")
-    lines.append("## Page-Specific Components")
-    lines.append("")
-    unique_components = page_overrides.get("unique_components", [])
-    if unique_components:
-        for comp in unique_components:
-            lines.append(f"- {comp}")
-    else:
-        lines.append("- No unique components for this page")
-    lines.append("")
-    
-    # Recommendations
-    lines.append("---")
-    lines.append("")
-    lines.append("## Recommendations")
-    lines.append("")
-    recommendations = page_overrides.get("recommendations", [])
-    if recommendations:
-        for rec in recommendations:
-            lines.append(f"- {rec}")
-    lines.append("")
-    
-    return "\n".join(lines)
+
+    return templates.PAGE_OVERRIDE_MD.render(
+        page_title=page_name.replace("-", " ").replace("_", " ").title(),
+        project=design_system.get("project_name", "PROJECT"),
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        page_type=page_overrides.get('page_type', 'General'),
+        layout=_override_lines(page_overrides.get("layout", {}), "- No overrides — use Master layout"),
+        spacing=_override_lines(page_overrides.get("spacing", {}), "- No overrides — use Master spacing"),
+        typography=_override_lines(page_overrides.get("typography", {}), "- No overrides — use Master typography"),
+        colors=_override_lines(page_overrides.get("colors", {}), "- No overrides — use Master colors"),
+        components=_override_lines(page_overrides.get("components", []), "- No overrides — use Master component specs"),
+        unique_components=_override_lines(page_overrides.get("unique_components", []), "- No unique components for this page"),
+        recommendations=[f"- {rec}" for rec in page_overrides.get("recommendations", [])],
+    )
+
+
+def _page_context(page_name: str, page_query: str = None) -> str:
+    """Search text for a page override: page name and page query, lowercased."""
+    return f"{page_name.lower()} {(page_query or '').lower()}"
 
 
 def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
@@ -1001,14 +1119,12 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     """
     from core import search
     
-    page_lower = page_name.lower()
-    query_lower = (page_query or "").lower()
-    combined_context = f"{page_lower} {query_lower}"
+    combined_context = _page_context(page_name, page_query)
     
     # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    style_search = search(combined_context, "style", max_results=OVERRIDE_SEARCH_CONFIG["style"]["max_results"])
+    ux_search = search(combined_context, "ux", max_results=OVERRIDE_SEARCH_CONFIG["ux"]["max_results"])
+    landing_search = search(combined_context, "landing", max_results=OVERRIDE_SEARCH_CONFIG["landing"]["max_results"])
     
     # Extract results from search response
     style_results = style_search.get("results", [])
@@ -1133,16 +1249,179 @@ def _detect_page_type(context: str, style_results: list) -> str:
     return "General"
 
 
+# ============ BATCH GENERATION ============
+def load_batch_manifest(path: str) -> dict:
+    """
+    Read a batch manifest: JSON, or YAML (.yaml/.yml) when PyYAML is installed.
+
+        {
+          "output_dir": "optional/base/dir",
+          "projects": [
+            {"query": "SaaS dashboard", "name": "Acme", "pages": ["dashboard", {"name": "checkout", "query": "checkout payment"}]}
+          ]
+        }
+
+    "name" defaults to the upper-cased query (as in generate); a page is a
+    name or {"name", "query"}, its query defaulting to the project's.
+
+    Returns:
+        The manifest with every project and page normalized to dicts
+
+    Raises:
+        ValueError: malformed manifest, or two items that would write the same file
+    """
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"{path}: YAML manifests need PyYAML (pip install pyyaml); use JSON instead")
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            raise ValueError(f"{path}: invalid YAML: {exc}")
+    else:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{path}: invalid JSON: {exc}")
+
+    if not isinstance(data, dict) or not isinstance(data.get("projects"), list):
+        raise ValueError(f"{path}: expected an object with a \"projects\" list")
+
+    projects = []
+    targets = set()
+    for i, item in enumerate(data["projects"]):
+        if not isinstance(item, dict) or not isinstance(item.get("query"), str) or not item["query"].strip():
+            raise ValueError(f"{path}: projects[{i}] needs a non-empty \"query\"")
+        query = item["query"]
+        name = item.get("name") or query.upper()
+        if not isinstance(name, str):
+            raise ValueError(f"{path}: projects[{i}].name must be a string")
+        pages = []
+        for j, page in enumerate(item.get("pages") or []):
+            if isinstance(page, str):
+                page = {"name": page}
+            if not isinstance(page, dict) or not isinstance(page.get("name"), str) or not page["name"].strip():
+                raise ValueError(f"{path}: projects[{i}].pages[{j}] must be a name or an object with \"name\"")
+            pages.append({"name": page["name"], "query": page.get("query") or query})
+
+        for target in [(_slug(name), None)] + [(_slug(name), _slug(page["name"])) for page in pages]:
+            if target in targets:
+                raise ValueError(f"{path}: projects[{i}] writes {'/'.join(t for t in target if t)} more than once")
+            targets.add(target)
+        projects.append({"query": query, "name": name, "pages": pages})
+
+    return {"output_dir": data.get("output_dir"), "projects": projects}
+
+
+def generate_batch(manifest: dict, output_dir: str = None, workers: int = None, snapshot: bool = False,
+                   contrast_warnings: bool = False) -> dict:
+    """
+    Generate and persist every project and page of a manifest in one process.
+
+    Projects run on a thread pool that shares core's loaded indexes and a
+    single reasoning index; as soon as a project's MASTER.md is written its
+    page overrides are queued on the same pool. Unchanged files are left
+    alone (see _write_if_changed). A failing item is reported in "errors"
+    and does not stop the others.
+
+    Args:
+        manifest: As returned by load_batch_manifest
+        output_dir: Base directory; overrides the manifest's (default: cwd)
+        workers: Pool size (default: BATCH_WORKERS)
+        snapshot: Start each project from its category skeleton (see CategorySnapshots)
+        contrast_warnings: List failing WCAG contrast pairs in each MASTER.md
+
+    Returns:
+        Summary report: per-project files (and which were created, updated
+        or unchanged), errors, totals and elapsed time
+    """
+    started = time.perf_counter()
+    output_dir = output_dir or manifest.get("output_dir")
+    generator = DesignSystemGenerator(snapshots=default_snapshots() if snapshot else None)
+    generator.reasoning_index  # build it once, before the workers share it
+
+    def build_project(project: dict) -> tuple:
+        design_system = generator.generate(project["query"], project["name"])
+        design_system_dir = _design_system_dir(design_system, output_dir)
+        return design_system, design_system_dir, _write_master(design_system_dir, design_system, contrast_warnings)
+
+    def failure(project: dict, page: dict, exc: Exception) -> dict:
+        return {"project": project["name"], "page": page and page["name"], "error": f"{type(exc).__name__}: {exc}"}
+
+    projects, errors, page_jobs = [], [], []
+    with ThreadPoolExecutor(max_workers=workers or BATCH_WORKERS, thread_name_prefix="design-batch") as pool:
+        jobs = [(project, pool.submit(build_project, project)) for project in manifest["projects"]]
+        for project, job in jobs:
+            try:
+                design_system, design_system_dir, master = job.result()
+            except Exception as exc:
+                errors.append(failure(project, None, exc))
+                continue
+            entry = {
+                "name": design_system["project_name"],
+                "query": project["query"],
+                "category": design_system["category"],
+                "design_system_dir": str(design_system_dir),
+                "files": [master]
+            }
+            projects.append(entry)
+            for page in project["pages"]:
+                page_jobs.append((project, page, entry, pool.submit(
+                    _write_page_override, design_system_dir, design_system, page["name"], page["query"])))
+
+        for project, page, entry, job in page_jobs:
+            try:
+                entry["files"].append(job.result())
+            except Exception as exc:
+                errors.append(failure(project, page, exc))
+
+    for entry in projects:
+        written = entry["files"]  # (path, status) pairs until here
+        entry.update(files=[str(path) for path, _ in written], **_write_summary(written))
+    files = sum(len(entry["files"]) for entry in projects)
+    counts = {status: sum(len(entry[status]) for entry in projects) for status in ("created", "updated", "unchanged")}
+    return {
+        "status": "success" if not errors else ("partial" if projects else "failed"),
+        "output_dir": str(Path(output_dir) if output_dir else Path.cwd()),
+        "projects": projects,
+        "errors": errors,
+        "totals": {"projects": len(projects), "pages": files - len(projects), "files": files, **counts,
+                   "errors": len(errors)},
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+
 # ============ CLI SUPPORT ============
 if __name__ == "__main__":
     import argparse
+    import sys
 
     parser = argparse.ArgumentParser(description="Generate Design System")
-    parser.add_argument("query", help="Search query (e.g., 'SaaS dashboard')")
+    parser.add_argument("query", nargs="?", help="Search query (e.g., 'SaaS dashboard')")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name")
     parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format")
+    parser.add_argument("--batch", metavar="MANIFEST", help="Persist every project and page of a JSON/YAML manifest; prints a JSON report")
+    parser.add_argument("--output-dir", "-o", type=str, default=None, help="Base directory for --batch output (default: manifest's, else cwd)")
+    parser.add_argument("--workers", type=int, default=None, help=f"Worker threads for --batch (default: {BATCH_WORKERS})")
+    parser.add_argument("--snapshot", action="store_true", help="Start from the precomputed skeleton of the matched product type")
+    parser.add_argument("--contrast-warnings", action="store_true", help="List palette pairs below WCAG AA contrast")
 
     args = parser.parse_args()
 
-    result = generate_design_system(args.query, args.project_name, args.format)
+    if args.batch:
+        try:
+            manifest = load_batch_manifest(args.batch)
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+        report = generate_batch(manifest, args.output_dir, args.workers, args.snapshot, args.contrast_warnings)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        sys.exit(1 if report["errors"] else 0)
+    if not args.query:
+        parser.error("query is required unless --batch is given")
+
+    result = generate_design_system(args.query, args.project_name, args.format, snapshot=args.snapshot,
+                                    contrast_warnings=args.contrast_warnings)
     print(result)
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Templates - documents written by design_system, compiled once
+
+Template text is literal except for slots:
+
+  {{name}}          inline slot, replaced by str(value) (as an f-string would)
+  {{name}} alone    block slot, replaced by a list of lines (each gets its
+  on a line         newline; an empty list leaves no line at all)
+
+Braces outside slots are plain text, so CSS needs no escaping. Each
+template is compiled once, at import, into a render function whose body is
+a single join over the static chunks (already assembled) and the slot
+values, so rendering a document is one call and one join.
+"""
+
+import re
+
+_SLOT = re.compile(r"^\{\{(\w+)\}\}\n|\{\{(\w+)\}\}", re.M)
+
+
+class Template:
+    """A template compiled to a render function; render(**slots) fills it"""
+
+    def __init__(self, text):
+        chunks = {}   # constant name -> static text
+        parts = []    # expressions joined by the render function
+        slots = []
+        pos = 0
+        for m in _SLOT.finditer(text):
+            chunk = f"_c{len(chunks)}"
+            chunks[chunk] = text[pos:m.start()]
+            name = m.group(1) or m.group(2)
+            parts.append(chunk)
+            if m.group(1):
+                parts.append(f'("\\n".join({name}) + "\\n" if {name} else "")')
+            else:
+                parts.append(f"str({name})")
+            if name not in slots:
+                slots.append(name)
+            pos = m.end()
+        chunks[f"_c{len(chunks)}"] = text[pos:]
+        parts.append(f"_c{len(chunks) - 1}")
+
+        params = f"*, {', '.join(slots)}" if slots else ""
+        source = f"def render({params}):\n    return ''.join(({', '.join(parts)},))\n"
+        namespace = dict(chunks)
+        exec(compile(source, f"<template {len(text)} chars>", "exec"), namespace)
+        self.render = namespace["render"]
+        self.slots = tuple(slots)
+
+
+# ============ DESIGN SYSTEM (--design-system -f markdown) ============
+DESIGN_SYSTEM_MD = Template("""\
+## Design System: {{project}}
+
+### Pattern
+- **Name:** {{pattern_name}}
+{{pattern_details}}
+- **Sections:** {{sections}}
+
+### Style
+- **Name:** {{style_name}}
+{{style_details}}
+
+### Colors
+| Role | Hex | CSS Variable |
+|------|-----|--------------|
+{{color_rows}}
+
+### Typography
+- **Heading:** {{heading}}
+- **Body:** {{body}}
+{{typography_details}}
+
+{{effects}}
+{{anti_patterns}}
+### Pre-Delivery Checklist
+- [ ] No emojis as icons (use SVG: Heroicons/Lucide)
+- [ ] cursor-pointer on all clickable elements
+- [ ] Hover states with smooth transitions (150-300ms)
+- [ ] Light mode: text contrast 4.5:1 minimum
+- [ ] Focus states visible for keyboard nav
+- [ ] prefers-reduced-motion respected
+- [ ] Responsive: 375px, 768px, 1024px, 1440px
+""")
+
+
+# ============ MASTER.md ============
+MASTER_MD = Template("""\
+# Design System Master File
+
+> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.
+> If that file exists, its rules **override** this Master file.
+> If not, strictly follow the rules below.
+
+---
+
+**Project:** {{project}}
+**Generated:** {{timestamp}}
+**Category:** {{category}}
+
+---
+
+## Global Rules
+
+### Color Palette
+
+| Role | Hex | CSS Variable |
+|------|-----|--------------|
+{{color_rows}}
+
+{{color_notes}}
+### Typography
+
+- **Heading Font:** {{heading}}
+- **Body Font:** {{body}}
+{{typography_details}}
+
+{{css_import}}
+### Spacing Variables
+
+| Token | Value | Usage |
+|-------|-------|-------|
+| `--space-xs` | `4px` / `0.25rem` | Tight gaps |
+| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |
+| `--space-md` | `16px` / `1rem` | Standard padding |
+| `--space-lg` | `24px` / `1.5rem` | Section padding |
+| `--space-xl` | `32px` / `2rem` | Large gaps |
+| `--space-2xl` | `48px` / `3rem` | Section margins |
+| `--space-3xl` | `64px` / `4rem` | Hero padding |
+
+### Shadow Depths
+
+| Level | Value | Usage |
+|-------|-------|-------|
+| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |
+| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |
+| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |
+| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |
+
+---
+
+## Component Specs
+
+### Buttons
+
+```css
+/* Primary Button */
+.btn-primary {
+  background: {{cta}};
+  color: white;
+  padding: 12px 24px;
+  border-radius: 8px;
+  font-weight: 600;
+  transition: all 200ms ease;
+  cursor: pointer;
+}
+
+.btn-primary:hover {
+  opacity: 0.9;
+  transform: translateY(-1px);
+}
+
+/* Secondary Button */
+.btn-secondary {
+  background: transparent;
+  color: {{primary}};
+  border: 2px solid {{primary}};
+  padding: 12px 24px;
+  border-radius: 8px;
+  font-weight: 600;
+  transition: all 200ms ease;
+  cursor: pointer;
+}
+```
+
+### Cards
+
+```css
+.card {
+  background: {{background}};
+  border-radius: 12px;
+  padding: 24px;
+  box-shadow: var(--shadow-md);
+  transition: all 200ms ease;
+  cursor: pointer;
+}
+
+.card:hover {
+  box-shadow: var(--shadow-lg);
+  transform: translateY(-2px);
+}
+```
+
+### Inputs
+
+```css
+.input {
+  padding: 12px 16px;
+  border: 1px solid #E2E8F0;
+  border-radius: 8px;
+  font-size: 16px;
+  transition: border-color 200ms ease;
+}
+
+.input:focus {
+  border-color: {{primary}};
+  outline: none;
+  box-shadow: 0 0 0 3px {{primary}}20;
+}
+```
+
+### Modals
+
+```css
+.modal-overlay {
+  background: rgba(0, 0, 0, 0.5);
+  backdrop-filter: blur(4px);
+}
+
+.modal {
+  background: white;
+  border-radius: 16px;
+  padding: 32px;
+  box-shadow: var(--shadow-xl);
+  max-width: 500px;
+  width: 90%;
+}
+```
+
+---
+
+## Style Guidelines
+
+**Style:** {{style_name}}
+
+{{style_details}}
+### Page Pattern
+
+**Pattern Name:** {{pattern_name}}
+
+{{pattern_details}}
+- **Section Order:** {{sections}}
+
+---
+
+## Anti-Patterns (Do NOT Use)
+
+{{anti_patterns}}
+
+### Additional Forbidden Patterns
+
+- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)
+- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer
+- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout
+- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio
+- ❌ **Instant state changes** — Always use transitions (150-300ms)
+- ❌ **Invisible focus states** — Focus states must be visible for a11y
+
+---
+
+## Pre-Delivery Checklist
+
+Before delivering any UI code, verify:
+
+- [ ] No emojis used as icons (use SVG instead)
+- [ ] All icons from consistent icon set (Heroicons/Lucide)
+- [ ] `cursor-pointer` on all clickable elements
+- [ ] Hover states with smooth transitions (150-300ms)
+- [ ] Light mode: text contrast 4.5:1 minimum
+- [ ] Focus states visible for keyboard navigation
+- [ ] `prefers-reduced-motion` respected
+- [ ] Responsive: 375px, 768px, 1024px, 1440px
+- [ ] No content hidden behind fixed navbars
+- [ ] No horizontal scroll on mobile
+""")
+
+
+# ============ pages/<page>.md ============
+PAGE_OVERRIDE_MD = Template("""\
+# {{page_title}} Page Overrides
+
+> **PROJECT:** {{project}}
+> **Generated:** {{timestamp}}
+> **Page Type:** {{page_type}}
+
+> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).
+> Only deviations from the Master are documented here. For all other rules, refer to the Master.
+
+---
+
+## Page-Specific Rules
+
+### Layout Overrides
+
+{{layout}}
+
+### Spacing Overrides
+
+{{spacing}}
+
+### Typography Overrides
+
+{{typography}}
+
+### Color Overrides
+
+{{colors}}
+
+### Component Overrides
+
+{{components}}
+
+---
+
+## Page-Specific Components
+
+{{unique_components}}
+
+---
+
+## Recommendations
+
+{{recommendations}}
+""")
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-line cost of the Swift diff scanner in detect_loc_entities.
+Usage: python bench/scan_bench.py [--lines 1000000] [--distinct 5000] [--runs 3]
+
+Builds a synthetic unified diff (added/removed/context lines mixing
+`.local` keys, key-like literals, format strings, comments and plain
+hardcoded text, over --distinct variants of each) and times, as JSON:
+  - legacy   the former per-line scan (LOCAL_KEY_RE and STRING_LITERAL_RE
+             each walk the line, should_ignore_literal per literal with an
+             uncompiled key-likeness regex)
+  - scan     SwiftDiffParser.feed with the single-pass scan_line
+Both are run on the same lines and must find the same keys and literals.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+
+import detect_loc_entities as loc  # noqa: E402
+
+BODY_LINES = [
+    '        titleLabel.text = "intlHomeTitle{n}".local',
+    '        button.setTitle("home_more_{n}".local, for: .normal)',
+    '        let message = "Tap to retry {n}"',
+    '        print("%d", count)',
+    '        // "commented out text {n}"',
+    '        let key = "voice_record_{n}"',
+    '        alert.message = String(format: "%@ items ({n})".local, name)',
+    '        view.backgroundColor = .white',
+    '        label.text = "Welcome back, {n}!"',
+    '        return "setting.privacy.{n}".local + " " + "Done"',
+]
+
+
+def synthetic_diff(n_lines, distinct=5000, lines_per_file=400):
+    """n_lines of a unified diff spread over one Swift file per lines_per_file"""
+    out = []
+    n = 0
+    while len(out) < n_lines:
+        out.append(f'diff --git a/App/View{n}.swift b/App/View{n}.swift')
+        out.append(f'--- a/App/View{n}.swift')
+        out.append(f'+++ b/App/View{n}.swift')
+        for h in range(lines_per_file // 10):
+            out.append(f'@@ -{h * 20 + 1},4 +{h * 20 + 1},6 @@')
+            for i in range(8):
+                text = BODY_LINES[(n + h + i) % len(BODY_LINES)].format(n=(n * 100 + h) % distinct)
+                out.append(('+', '-', ' ')[i % 3] + text)
+        n += 1
+    return out[:n_lines]
+
+
+# ============ LEGACY ============
+def _legacy_is_probably_key(s):
+    if not s:
+        return False
+    if re.match(r'^[A-Za-z0-9_.-]+$', s):
+        if s.startswith(('intl', 'voice_', 'home_', 'more_', 'setting', 'language_')):
+            return True
+        if '_' in s or '.' in s:
+            return True
+    return False
+
+
+def _legacy_should_ignore(line, value):
+    stripped = line.strip()
+    if stripped.startswith(('import ', '//', '/*', '*')):
+        return True
+    if _legacy_is_probably_key(value):
+        return True
+    if value in ('%d', '%@', '%s'):
+        return True
+    return False
+
+
+def legacy_scan(lines):
+    keys, literals = set(), []
+    new_line = 0
+    for raw in lines:
+        if raw.startswith('+++ b/'):
+            new_line = 0
+            continue
+        h = loc.HUNK_RE.match(raw)
+        if h:
+            new_line = int(h.group('new'))
+            continue
+        if raw.startswith('+') and not raw.startswith('+++'):
+            ln = new_line
+            new_line += 1
+        elif raw.startswith('-') and not raw.startswith('---'):
+            ln = None
+        else:
+            if raw.startswith(' '):
+                new_line += 1
+            continue
+        line = raw[1:]
+        for m in loc.LOCAL_KEY_RE.finditer(line):
+            keys.add(m.group(1))
+        for m in loc.STRING_LITERAL_RE.finditer(line):
+            value = m.group(1)
+            if _legacy_should_ignore(line, value):
+                continue
+            literals.append((ln, value, line.strip()))
+    return keys, literals
+
+
+# ============ CURRENT ============
+def current_scan(lines):
+    loc.is_probably_key.cache_clear()
+    parser = loc.SwiftDiffParser()
+    for raw in lines:
+        parser.feed(raw)
+    keys = parser.added_local_keys | parser.removed_local_keys
+    literals = parser.added_literals + parser.removed_literals
+    return keys, literals
+
+
+def _best(fn, lines, runs):
+    best = None
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn(lines)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Swift diff line scanner")
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Synthetic diff size in lines")
+    parser.add_argument("--distinct", type=int, default=5000, help="Distinct values per line template")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per scanner (best is kept)")
+    args = parser.parse_args()
+
+    lines = synthetic_diff(args.lines, args.distinct)
+    legacy_s, (legacy_keys, legacy_literals) = _best(legacy_scan, lines, args.runs)
+    # One file keeps the parser from flushing, so its buffers hold every line
+    single_file = [raw for raw in lines if not raw.startswith(('diff ', '--- ', '+++ '))]
+    current_s, (keys, literals) = _best(current_scan, ['+++ b/App/All.swift'] + single_file, args.runs)
+
+    report = {
+        "lines": len(lines),
+        "distinct": args.distinct,
+        "runs": args.runs,
+        "legacy": {"seconds": round(legacy_s, 3), "ns_per_line": round(legacy_s / len(lines) * 1e9)},
+        "scan": {"seconds": round(current_s, 3), "ns_per_line": round(current_s / len(lines) * 1e9)},
+        "speedup": round(legacy_s / current_s, 2),
+        "keys": len(keys),
+        "literals": len(literals),
+        "identical": keys == legacy_keys and sorted(literals, key=repr) == sorted(legacy_literals, key=repr),
+    }
+    print(json.dumps(report, indent=2))
+    if not report["identical"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
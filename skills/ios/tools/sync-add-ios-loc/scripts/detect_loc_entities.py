@@ -1,30 +1,148 @@
 #!/usr/bin/env python3
 import argparse
+import difflib
+import functools
 import json
+import os
 import re
 import subprocess
-from collections import defaultdict
+import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 STRING_ASSIGN_RE = re.compile(r'^"([^"\\]+)"\s*=\s*"((?:\\.|[^"\\])*)";\s*$')
 STRING_LITERAL_RE = re.compile(r'"((?:\\.|[^"\\])*)"')
 LOCAL_KEY_RE = re.compile(r'"([^"\\]+)"\s*\.\s*local\b')
+# Single pass per line: each string literal, and whether `.local` follows it
+LITERAL_SCAN_RE = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"(\s*\.\s*local\b)?')
+KEY_LIKE_RE = re.compile(r'^[A-Za-z0-9_.-]+$')
+KEY_PREFIXES = ('intl', 'voice_', 'home_', 'more_', 'setting', 'language_')
+IGNORED_LINE_PREFIXES = ('import ', '//', '/*', '*')
+IGNORED_VALUES = frozenset(('%d', '%@', '%s'))
 HUNK_RE = re.compile(r'^@@ -(?P<old>\d+)(?:,\d+)? \+(?P<new>\d+)(?:,\d+)? @@')
 
+# --workers > 1: diff lines per process-pool task (always whole files)
+PARALLEL_BATCH_LINES = 10000
+NULL_SHA = '0' * 40
 
-def run(cmd, cwd):
-    p = subprocess.run(cmd, cwd=cwd, text=True, capture_output=True)
+
+def stream_lines(cmd, cwd):
+    # Yield the command's stdout line by line (same splitting as str.splitlines)
+    # without ever holding the whole output; stderr goes to a temp file so a
+    # chatty stderr cannot block the pipe.
+    with tempfile.TemporaryFile() as err:
+        p = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=err,
+                             text=True, encoding='utf-8', errors='replace')
+        try:
+            for chunk in p.stdout:
+                yield from chunk.splitlines()
+            p.stdout.close()
+            if p.wait() != 0:
+                err.seek(0)
+                stderr = err.read().decode('utf-8', 'replace').strip()
+                raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{stderr}")
+        finally:
+            if p.poll() is None:
+                p.kill()
+                p.wait()
+
+
+def git_output(cmd, cwd) -> bytes:
+    p = subprocess.run(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     if p.returncode != 0:
-        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{p.stderr.strip()}")
+        stderr = p.stderr.decode('utf-8', 'replace').strip()
+        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{stderr}")
     return p.stdout
 
 
+class BlobReader:
+    # One `git cat-file --batch` process answering every blob read of a run,
+    # instead of a git process per file.
+
+    def __init__(self, cwd):
+        self.p = subprocess.Popen(['git', 'cat-file', '--batch'], cwd=cwd,
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def read(self, sha: str) -> bytes:
+        if sha == NULL_SHA:  # the missing side of an added or deleted file
+            return b''
+        self.p.stdin.write(sha.encode('ascii') + b'\n')
+        self.p.stdin.flush()
+        header = self.p.stdout.readline().split()
+        if len(header) != 3 or header[1] != b'blob':
+            raise RuntimeError(f'git cat-file --batch: cannot read blob {sha}')
+        data = self.p.stdout.read(int(header[2]))
+        self.p.stdout.read(1)  # newline after the contents
+        return data
+
+    def close(self):
+        self.p.stdin.close()
+        self.p.stdout.close()
+        self.p.wait()
+
+
+def tree_changes(cwd, from_ref, to_ref, pathspecs):
+    # (status, old_path, new_path, old_sha, new_sha) per file changed between
+    # two commits, from `git diff-tree`: trees only, no index or working tree
+    cmd = ['git', 'diff-tree', '-r', '-z', '-M', from_ref, to_ref, '--', *pathspecs]
+    fields = git_output(cmd, cwd).decode('utf-8', 'replace').split('\0')
+    i = 0
+    while i + 1 < len(fields):
+        _, _, old_sha, new_sha, status = fields[i][1:].split(' ')
+        old_path = new_path = fields[i + 1]
+        i += 2
+        if status[0] in 'RC':
+            new_path = fields[i]
+            i += 1
+        yield status[0], old_path, new_path, old_sha, new_sha
+
+
+def blob_diff_lines(cwd, from_ref, to_ref, pathspecs):
+    # The `git diff --unified=0 from_ref to_ref` lines the parsers expect,
+    # rebuilt from blobs: the changed files come from one diff-tree, their
+    # contents from one cat-file --batch and the hunks from difflib, whose
+    # alignment can differ from git's where lines match more than one way.
+    reader = BlobReader(cwd)
+    try:
+        for status, old_path, new_path, old_sha, new_sha in tree_changes(cwd, from_ref, to_ref, pathspecs):
+            old, new = reader.read(old_sha), reader.read(new_sha)
+            yield f'diff --git a/{old_path} b/{new_path}'
+            if b'\0' in old or b'\0' in new:
+                continue  # binary, as `Binary files differ`
+            yield '--- /dev/null' if status == 'A' else f'--- a/{old_path}'
+            yield '+++ /dev/null' if status == 'D' else f'+++ b/{new_path}'
+            hunks = difflib.unified_diff(old.decode('utf-8', 'replace').splitlines(),
+                                         new.decode('utf-8', 'replace').splitlines(), n=0, lineterm='')
+            next(hunks, None)  # difflib's own ---/+++ header
+            next(hunks, None)
+            yield from hunks
+    finally:
+        reader.close()
+
+
+def split_base_section(lines, base_parser):
+    # One diff carries both pathspecs: the base strings file's section (the
+    # only one whose path is not *.swift) goes to base_parser, everything
+    # else is yielded, so the Swift parser sees exactly a `*.swift` diff.
+    in_base = False
+    for raw in lines:
+        if raw.startswith('diff --git '):
+            in_base = not raw.rstrip('"').endswith('.swift')
+        if in_base:
+            base_parser.feed(raw)
+        else:
+            yield raw
+
+
+@functools.lru_cache(maxsize=65536)
 def is_probably_key(s: str) -> bool:
     if not s:
         return False
     # Common i18n key patterns: intlXxx, voice_xxx, snake_case, dot.case
-    if re.match(r'^[A-Za-z0-9_.-]+$', s):
-        if s.startswith(('intl', 'voice_', 'home_', 'more_', 'setting', 'language_')):
+    if KEY_LIKE_RE.match(s):
+        if s.startswith(KEY_PREFIXES):
             return True
         if '_' in s or '.' in s:
             return True
@@ -33,141 +151,280 @@ def is_probably_key(s: str) -> bool:
 
 def should_ignore_literal(line: str, value: str) -> bool:
     stripped = line.strip()
-    if stripped.startswith(('import ', '//', '/*', '*')):
+    if stripped.startswith(IGNORED_LINE_PREFIXES):
         return True
     if is_probably_key(value):
         return True
-    if value in ('%d', '%@', '%s'):
+    if value in IGNORED_VALUES:
         return True
     return False
 
 
-def parse_swift_diff(diff_text: str):
-    entities = []
-    current_file = None
-    new_line = 0
+def scan_line(line: str, local_keys: set, literals: list, ln):
+    # One walk over the line: every literal followed by `.local` is a key
+    # usage; every literal that should_ignore_literal would keep is a
+    # hardcoded candidate (a `.local` literal can be both, as before).
+    #
+    # LOCAL_KEY_RE may also match from a quote that is not a literal's
+    # opening one (after an escaped quote, or from a closing quote up to a
+    # literal that starts with `.local`). Both need a backslash or a `local`
+    # that is not a literal's `.local` suffix, so such lines take their keys
+    # from LOCAL_KEY_RE and every key matches the former two-pass scan.
+    if '"' not in line:
+        return
+    stripped = line.strip()
+    ignore_all = stripped.startswith(IGNORED_LINE_PREFIXES)
+    keys = []
+    suffixes = 0
+    for value, local in LITERAL_SCAN_RE.findall(line):
+        if local:
+            suffixes += 1
+            if value:
+                keys.append(value)
+        if ignore_all or value in IGNORED_VALUES or is_probably_key(value):
+            continue
+        literals.append((ln, value, stripped))
+    if '\\' in line or line.count('local') != suffixes:
+        local_keys.update(m.group(1) for m in LOCAL_KEY_RE.finditer(line))
+    else:
+        local_keys.update(keys)
+
+
+class SwiftDiffParser:
+    # Incremental parse_swift_diff: feed() diff lines one at a time; a file's
+    # changes are returned as soon as the diff moves past it, so only one
+    # file's state is held in memory. Changes are plain tuples
+    # (file, new_keys, gone_keys, added_literals, removed_literals), cheap to
+    # send between processes; file_entities() turns them into entities.
+
+    def __init__(self):
+        self.current_file = None
+        self.new_line = 0
+        self._pending = None  # file whose entities are still being collected
+        self._reset()
+
+    def _reset(self):
+        self.added_local_keys = set()
+        self.removed_local_keys = set()
+        self.added_literals = []
+        self.removed_literals = []
+
+    def feed(self, raw: str):
+        # Returns the changes of a file when it ends, else None
+        c = raw[:1]
+        if c == '+':
+            if raw.startswith('+++'):
+                return self._start_file(raw) if raw.startswith('+++ b/') else None
+            if self.current_file:
+                scan_line(raw[1:], self.added_local_keys, self.added_literals, self.new_line)
+                self.new_line += 1
+        elif c == '-':
+            if self.current_file and not raw.startswith('---'):
+                scan_line(raw[1:], self.removed_local_keys, self.removed_literals, None)
+        elif c == ' ':
+            if self.current_file:
+                self.new_line += 1
+        elif c == '@':
+            h = HUNK_RE.match(raw)
+            if h:
+                self.new_line = int(h.group('new'))
+        return None
+
+    def _start_file(self, raw: str):
+        finished = None
+        path = raw[6:]
+        current = path if path.endswith('.swift') else None
+        if current != self._pending:
+            finished = self._flush()
+            self._pending = current
+        self.current_file = current
+        self.new_line = 0
+        return finished
+
+    def close(self):
+        return self._flush()
+
+    def _flush(self):
+        f = self._pending
+        if f is None:
+            return None
+        a, r = self.added_local_keys, self.removed_local_keys
+        changes = (f, sorted(a - r), sorted(r - a), self.added_literals, self.removed_literals)
+        self._pending = None
+        self._reset()
+        if not any(changes[1:]):
+            return None
+        return changes
+
+
+def file_entities(changes):
+    # (file, key_entities, literal_entities) for one file's SwiftDiffParser changes
+    f, new_keys, gone_keys, added_literals, removed_literals = changes
+    keys = [local_key_entity(f, k, '新增') for k in new_keys]
+    keys += [local_key_entity(f, k, '删除') for k in gone_keys]
+    literals = [literal_entity(f, ln, value, source, '新增') for ln, value, source in added_literals]
+    literals += [literal_entity(f, ln, value, source, '删除') for ln, value, source in removed_literals]
+    return f, keys, literals
+
+
+def local_key_entity(f, key, status):
+    return {
+        'type': 'local_key_usage',
+        'status': status,
+        'file': f,
+        'key': key,
+        'value': None,
+        'needs_review': False,
+    }
+
+
+def literal_entity(f, ln, value, source, status):
+    return {
+        'type': 'hardcoded_string_candidate',
+        'status': status,
+        'file': f,
+        'line': ln,
+        'key': None,
+        'value': value,
+        'source_line': source,
+        'needs_review': True,
+    }
+
+
+def iter_swift_files(lines, workers=1):
+    # (file, key_entities, literal_entities) per changed Swift file, in diff order
+    changes = iter_file_changes(lines) if workers == 1 else iter_file_changes_parallel(lines, workers)
+    for c in changes:
+        yield file_entities(c)
+
 
-    # Collect for status dedupe
-    added_local_keys = defaultdict(set)
-    removed_local_keys = defaultdict(set)
+def iter_file_changes(lines):
+    parser = SwiftDiffParser()
+    for raw in lines:
+        done = parser.feed(raw)
+        if done:
+            yield done
+    done = parser.close()
+    if done:
+        yield done
 
-    added_literals = defaultdict(list)
-    removed_literals = defaultdict(list)
 
-    for raw in diff_text.splitlines():
+def _file_batches(lines, size):
+    # Cut the diff into batches of about `size` lines, only where the file
+    # changes ('+++ b/' of another file), so every file is parsed by one task
+    # exactly as the serial parser sees it. '+++ /dev/null' is not a cut:
+    # the serial parser keeps such lines with the previous file.
+    batch = []
+    batch_file = None
+    for raw in lines:
         if raw.startswith('+++ b/'):
             path = raw[6:]
-            current_file = path if path.endswith('.swift') else None
-            new_line = 0
-            continue
-        h = HUNK_RE.match(raw)
-        if h:
-            new_line = int(h.group('new'))
-            continue
-        if not current_file:
-            continue
+            f = path if path.endswith('.swift') else None
+            if f != batch_file and len(batch) >= size:
+                yield batch
+                batch = []
+            batch_file = f
+        batch.append(raw)
+    if batch:
+        yield batch
+
+
+def _parse_batch(batch):
+    return list(iter_file_changes(batch))
+
+
+def iter_file_changes_parallel(lines, workers=0):
+    # iter_file_changes on a process pool (workers=0: one per core). Batches
+    # are submitted as the diff streams in, at most two per worker in flight,
+    # and results are yielded in submission order, so the output is the
+    # serial one.
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for batch in _file_batches(lines, PARALLEL_BATCH_LINES):
+            in_flight.append(pool.submit(_parse_batch, batch))
+            while len(in_flight) > 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
 
-        if raw.startswith('+') and not raw.startswith('+++'):
-            line = raw[1:]
-            for m in LOCAL_KEY_RE.finditer(line):
-                added_local_keys[current_file].add(m.group(1))
-            for m in STRING_LITERAL_RE.finditer(line):
-                value = m.group(1)
-                if should_ignore_literal(line, value):
-                    continue
-                added_literals[current_file].append((new_line, value, line.strip()))
-            new_line += 1
-        elif raw.startswith('-') and not raw.startswith('---'):
-            line = raw[1:]
-            for m in LOCAL_KEY_RE.finditer(line):
-                removed_local_keys[current_file].add(m.group(1))
-            for m in STRING_LITERAL_RE.finditer(line):
-                value = m.group(1)
-                if should_ignore_literal(line, value):
-                    continue
-                removed_literals[current_file].append((None, value, line.strip()))
-        elif raw.startswith(' '):
-            new_line += 1
-
-    # Key usage entities
-    all_files = set(added_local_keys.keys()) | set(removed_local_keys.keys())
-    for f in sorted(all_files):
-        a = added_local_keys[f]
-        r = removed_local_keys[f]
-        for k in sorted(a - r):
-            entities.append({
-                'type': 'local_key_usage',
-                'status': '新增',
-                'file': f,
-                'key': k,
-                'value': None,
-                'needs_review': False,
-            })
-        for k in sorted(r - a):
-            entities.append({
-                'type': 'local_key_usage',
-                'status': '删除',
-                'file': f,
-                'key': k,
-                'value': None,
-                'needs_review': False,
-            })
-
-    # Hardcoded string entities (candidate)
-    for f in sorted(set(added_literals.keys()) | set(removed_literals.keys())):
-        for ln, value, source in added_literals.get(f, []):
-            entities.append({
-                'type': 'hardcoded_string_candidate',
-                'status': '新增',
-                'file': f,
-                'line': ln,
-                'key': None,
-                'value': value,
-                'source_line': source,
-                'needs_review': True,
-            })
-        for ln, value, source in removed_literals.get(f, []):
-            entities.append({
-                'type': 'hardcoded_string_candidate',
-                'status': '删除',
-                'file': f,
-                'line': ln,
-                'key': None,
-                'value': value,
-                'source_line': source,
-                'needs_review': True,
-            })
 
+def parse_swift_diff(diff, workers=1):
+    # diff: the whole diff text, or any iterable of its lines (e.g. stream_lines)
+    lines = diff.splitlines() if isinstance(diff, str) else diff
+    files = sorted(iter_swift_files(lines, workers), key=lambda item: item[0])
+    entities = [e for _, keys, _ in files for e in keys]
+    entities += [e for _, _, literals in files for e in literals]
     return entities
 
 
-def parse_base_diff(diff_text: str):
-    old_map = {}
-    new_map = {}
-    for raw in diff_text.splitlines():
+class BaseDiffParser:
+    # Incremental parse_base_diff: feed() the base strings file's diff lines,
+    # result() once it ends; only the changed key/value pairs are kept.
+
+    def __init__(self):
+        self.old_map = {}
+        self.new_map = {}
+
+    def feed(self, raw: str):
         if raw.startswith('---') or raw.startswith('+++') or raw.startswith('@@'):
-            continue
-        if raw.startswith('-') and not raw.startswith('---'):
+            return
+        if raw.startswith('-'):
             m = STRING_ASSIGN_RE.match(raw[1:].strip())
             if m:
-                old_map[m.group(1)] = m.group(2)
-        if raw.startswith('+') and not raw.startswith('+++'):
+                self.old_map[m.group(1)] = m.group(2)
+        elif raw.startswith('+'):
             m = STRING_ASSIGN_RE.match(raw[1:].strip())
             if m:
-                new_map[m.group(1)] = m.group(2)
+                self.new_map[m.group(1)] = m.group(2)
 
-    old_keys = set(old_map.keys())
-    new_keys = set(new_map.keys())
+    def result(self):
+        old_map, new_map = self.old_map, self.new_map
+        old_keys = set(old_map.keys())
+        new_keys = set(new_map.keys())
 
-    added = sorted(new_keys - old_keys)
-    deleted = sorted(old_keys - new_keys)
-    modified = sorted(k for k in (old_keys & new_keys) if old_map[k] != new_map[k])
+        added = sorted(new_keys - old_keys)
+        deleted = sorted(old_keys - new_keys)
+        modified = sorted(k for k in (old_keys & new_keys) if old_map[k] != new_map[k])
+
+        return {
+            'added': [{'key': k, 'value': new_map[k]} for k in added],
+            'modified': [{'key': k, 'old_value': old_map[k], 'new_value': new_map[k]} for k in modified],
+            'deleted': [{'key': k, 'value': old_map[k]} for k in deleted],
+        }
+
+
+def parse_base_diff(diff):
+    parser = BaseDiffParser()
+    for raw in (diff.splitlines() if isinstance(diff, str) else diff):
+        parser.feed(raw)
+    return parser.result()
 
-    return {
-        'added': [{'key': k, 'value': new_map[k]} for k in added],
-        'modified': [{'key': k, 'old_value': old_map[k], 'new_value': new_map[k]} for k in modified],
-        'deleted': [{'key': k, 'value': old_map[k]} for k in deleted],
-    }
+
+def write_jsonl(out, base_file, diff_ref, swift_files, base_changes, to_ref=''):
+    # One JSON object per line, flushed per file: Swift entities as each file's
+    # diff is parsed, then one base_key_change record per changed key.
+    def emit(record):
+        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    meta = {'type': 'meta', 'base_file': base_file, 'diff_ref': diff_ref}
+    if to_ref:
+        meta['to_ref'] = to_ref
+    emit(meta)
+    for _, keys, literals in swift_files:
+        for e in keys + literals:
+            emit(e)
+        out.flush()
+    for change, items in base_changes().items():
+        for item in items:
+            emit({'type': 'base_key_change', 'change': change, **item})
+
+
+def non_negative_int(text):
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f'must be >= 0, got {value}')
+    return value
 
 
 def main():
@@ -175,21 +432,54 @@ def main():
     parser.add_argument('--repo-root', default='.')
     parser.add_argument('--base-file', required=True, help='Path to base Localizable.strings')
     parser.add_argument('--diff-ref', default='HEAD', help='Compare against this ref. Default: HEAD')
+    parser.add_argument('--to-ref', default='',
+                        help='Compare --diff-ref with this ref instead of the working tree')
+    parser.add_argument('--cat-file', action='store_true',
+                        help='With --to-ref: read both sides through one `git cat-file --batch` and diff them here')
     parser.add_argument('--output', default='')
+    parser.add_argument('--jsonl', action='store_true',
+                        help='Stream JSON Lines (one entity per line, written as each file is parsed)')
+    parser.add_argument('--workers', type=non_negative_int, default=1,
+                        help='Parse changed Swift files on N processes (0: one per core). Default: 1')
     args = parser.parse_args()
+    if args.cat_file and not args.to_ref:
+        parser.error('--cat-file requires --to-ref')
 
     root = Path(args.repo_root).resolve()
     base_file = str(Path(args.base_file))
 
-    swift_diff = run(['git', 'diff', '--unified=0', args.diff_ref, '--', '*.swift'], cwd=str(root))
-    base_diff = run(['git', 'diff', '--unified=0', args.diff_ref, '--', base_file], cwd=str(root))
+    # A single git run covers the Swift files and the base strings file
+    pathspecs = ['*.swift', base_file]
+    if args.cat_file:
+        diff = blob_diff_lines(str(root), args.diff_ref, args.to_ref, pathspecs)
+    else:
+        refs = [args.diff_ref, args.to_ref] if args.to_ref else [args.diff_ref]
+        diff = stream_lines(['git', 'diff', '--unified=0', *refs, '--', *pathspecs], cwd=str(root))
+    base = BaseDiffParser()
+    swift_diff = split_base_section(diff, base)
+
+    def base_changes():
+        # Complete once swift_diff has been read to the end
+        return base.result()
+
+    if args.jsonl:
+        out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            write_jsonl(out, base_file, args.diff_ref, iter_swift_files(swift_diff, args.workers),
+                        base_changes, args.to_ref)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return
 
     out = {
         'base_file': base_file,
         'diff_ref': args.diff_ref,
-        'swift_entities': parse_swift_diff(swift_diff),
-        'base_key_changes': parse_base_diff(base_diff),
     }
+    if args.to_ref:
+        out['to_ref'] = args.to_ref
+    out['swift_entities'] = parse_swift_diff(swift_diff, args.workers)
+    out['base_key_changes'] = base_changes()
 
     text = json.dumps(out, ensure_ascii=False, indent=2)
     if args.output:
@@ -0,0 +1,302 @@
+import csv
+import os
+import random
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "skills" / "design" / "ui-ux-pro-max" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import core  # noqa: E402
+import corpus  # noqa: E402
+import search  # noqa: E402
+
+
+def regex_detect_domain(query: str) -> str:
+    # detect_domain as it was before KeywordMatcher: one \b-anchored regex per keyword
+    query_lower = query.lower()
+    scores = {
+        domain: sum(1 for kw in keywords if re.search(r"\b" + re.escape(kw) + r"\b", query_lower))
+        for domain, keywords in core.DOMAIN_KEYWORDS.items()
+    }
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else "style"
+
+
+def regex_keywords(text: str) -> set:
+    return {
+        kw
+        for keywords in core.DOMAIN_KEYWORDS.values()
+        for kw in keywords
+        if re.search(r"\b" + re.escape(kw) + r"\b", text)
+    }
+
+
+class DetectDomainTests(unittest.TestCase):
+    SAMPLES = [
+        "",
+        "   ",
+        "SaaS dashboard",
+        "#",
+        "#fff palette",
+        "a#b",
+        "c# ## # x",
+        "color#",
+        "e-commerce",
+        "ecommerce-store",
+        "next.js app",
+        "nextjs_app",
+        "non-profit charity",
+        "ui/ux",
+        "ui_kit",
+        "_font",
+        "font_",
+        "font2",
+        "font for headings",
+        "Font For Headings",
+        "fontfor",
+        "sans-serif font",
+        "sans serif font",
+        "plant  care",
+        "plant care app",
+        "café font",
+        "ñfont",
+        "font ñ",
+        "icons icon svg icon",
+        "dark mode glassmorphism",
+        "focus-visible outline",
+        "server component rsc",
+        "input type=email form",
+        "real estate landing page hero",
+        "chart: bar/pie (trend)",
+        "meditation sleep habit tracker",
+    ]
+
+    def test_matches_baseline_regex_on_samples(self) -> None:
+        for query in self.SAMPLES:
+            with self.subTest(query=query):
+                self.assertEqual(core.detect_domain(query), regex_detect_domain(query))
+                self.assertEqual(core._DOMAIN_MATCHER.find_all(query.lower()), regex_keywords(query.lower()))
+
+    def test_matches_baseline_regex_on_random_joins(self) -> None:
+        # Keywords and fragments glued by word and non-word characters exercise
+        # the single-character \b checks on both sides of every match
+        rng = random.Random(26)
+        keywords = [kw for kws in core.DOMAIN_KEYWORDS.values() for kw in kws]
+        pieces = keywords + ["a", "x1", "_", "é", "ñ", "", "s"]
+        glue = [" ", "", "-", "_", ".", "#", "/", "é", "1", "  "]
+        for _ in range(2000):
+            query = "".join(rng.choice(pieces) + rng.choice(glue) for _ in range(rng.randint(1, 5)))
+            with self.subTest(query=query):
+                self.assertEqual(core._DOMAIN_MATCHER.find_all(query), regex_keywords(query))
+                self.assertEqual(core.detect_domain(query), regex_detect_domain(query))
+
+
+def exhaustive_top_k(bm25, query, k):
+    # Head of the full ranking: every doc scored, sorted by score (ties by idx)
+    return [(idx, score) for idx, score in bm25.score(query) if score > 0][:k]
+
+
+class TopKTests(unittest.TestCase):
+    def test_top_k_equals_exhaustive_scoring_on_every_corpus(self) -> None:
+        rng = random.Random(29)
+        for tag, config in core._unified_sources():
+            filepath = core.DATA_DIR / config["file"]
+            if not filepath.exists():
+                continue
+            _, bm25 = core._load_index(filepath, config)
+            vocabulary = bm25.vocabulary()
+            # Most frequent terms give many tied and near-tied scores
+            common = sorted(vocabulary, key=lambda term: -len(bm25.postings(term)[0]))[:10]
+            queries = ["", "zzqx unknownterm", common[0], f"{common[0]} {common[0]}", " ".join(common[:3])]
+            for _ in range(40):
+                terms = rng.sample(vocabulary, rng.randint(1, 4)) + rng.sample(common, rng.randint(0, 2))
+                queries.append(" ".join(terms))
+            for query in queries:
+                ranking = bm25.score(query)
+                best = ranking[0][1] if ranking else 0
+                for k in (1, 3, 10, bm25.N + 5):
+                    with self.subTest(corpus=tag, query=query, k=k):
+                        self.assertEqual(bm25.top_k(query, k), exhaustive_top_k(bm25, query, k))
+                with self.subTest(corpus=tag, query=query, bound=True):
+                    self.assertGreaterEqual(bm25.query_bound(query) * (1 + 1e-9), best)
+
+
+class CorpusTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.csv_path = self.dir / "data.csv"
+        self.compiled_path = self.dir / "data.uxc"
+
+    def write_csv(self, rows) -> None:
+        with open(self.csv_path, "w", encoding="utf-8") as f:
+            f.write("Name,Notes\n" + "".join(f"{name},{notes}\n" for name, notes in rows))
+
+    def load(self, search_cols):
+        return corpus.load(self.csv_path, self.compiled_path, search_cols, core.tokenize, core.TOKENIZER_VERSION)
+
+    def test_counts_past_16_bits(self) -> None:
+        # 70000 tokens need a cell past csv's default 128 KiB field limit
+        self.addCleanup(csv.field_size_limit, csv.field_size_limit(1 << 20))
+        self.write_csv([("big", "alpha " * 70000), ("small", "alpha beta")])
+        compiled = self.load(["Name", "Notes"])
+        self.assertEqual(list(compiled.field_lengths), [1, 70000, 1, 2])
+        docs, field_tfs = compiled.field_postings("alpha")
+        self.assertEqual((list(docs), list(field_tfs)), ([0, 1], [0, 70000, 0, 1]))
+        self.assertEqual(list(compiled.postings("alpha")[1]), [70000, 1])
+
+    def test_changed_search_cols_rebuild(self) -> None:
+        self.write_csv([("alpha", "beta"), ("gamma", "alpha")])
+        self.assertEqual(list(self.load(["Name"]).postings("alpha")[0]), [0])
+        compiled = self.load(["Name", "Notes"])
+        self.assertEqual(compiled.header["search_cols"], ["Name", "Notes"])
+        self.assertEqual(list(compiled.postings("alpha")[0]), [0, 1])
+        self.assertEqual(corpus._open(self.compiled_path).header["search_cols"], ["Name", "Notes"])
+
+    def test_field_weights_apply_at_fit_time(self) -> None:
+        self.write_csv([("alpha", "beta"), ("beta", "alpha")])
+        self.load(["Name", "Notes"])
+        mtime = self.compiled_path.stat().st_mtime_ns
+        for weights, best in (((3, 1), 0), ((1, 3), 1)):
+            bm25 = core.BM25()
+            bm25.fit_corpus(self.load(["Name", "Notes"]), weights)
+            self.assertEqual(bm25.score("alpha")[0][0], best)
+        self.assertEqual(self.compiled_path.stat().st_mtime_ns, mtime)
+
+    def test_truncated_file_is_rebuilt(self) -> None:
+        self.write_csv([("alpha", "beta")])
+        self.load(["Name", "Notes"])
+        data = self.compiled_path.read_bytes()
+        self.compiled_path.write_bytes(data[:-6])
+        self.assertEqual(list(self.load(["Name", "Notes"]).postings("beta")[0]), [0])
+        self.assertEqual(self.compiled_path.read_bytes(), data)
+
+
+class ResultCacheTests(unittest.TestCase):
+    CONFIG = {"search_cols": ["Name", "Notes"], "output_cols": ["Name", "Notes"]}
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        data_dir = Path(tmp.name)
+        for name, value in (("DATA_DIR", data_dir), ("COMPILED_DIR", data_dir / "_compiled")):
+            patcher = mock.patch.object(core, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.csv_path = data_dir / "notes.csv"
+        self.write_csv("alpha,first note\nbeta,second note\n")
+        core.cache_clear(indexes=True)
+        self.addCleanup(core.cache_clear, indexes=True)
+
+    def write_csv(self, body) -> None:
+        self.csv_path.write_text("Name,Notes\n" + body, encoding="utf-8")
+
+    def search(self, query="note", max_results=3):
+        return core._search_csv(self.csv_path, self.CONFIG, query, max_results)
+
+    def test_identical_calls_hit(self) -> None:
+        first = self.search()
+        first[0]["Name"] = "changed"  # callers get copies
+        self.assertEqual(self.search(), [{"Name": "alpha", "Notes": "first note"},
+                                         {"Name": "beta", "Notes": "second note"}])
+        self.assertEqual(core.cache_info(), {"hits": 1, "misses": 1, "size": 1, "maxsize": core.RESULT_CACHE_SIZE})
+        self.search("note", 1)
+        self.assertEqual(core.cache_info()["misses"], 2)
+
+    def test_touched_csv_misses(self) -> None:
+        expected = self.search()
+        st = self.csv_path.stat()
+        os.utime(self.csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self.search(), expected)
+        self.assertEqual(core.cache_info()["hits"], 0)
+        self.assertEqual(core.cache_info()["misses"], 2)
+
+    def test_rewritten_csv_misses(self) -> None:
+        self.search()
+        st = self.csv_path.stat()
+        self.write_csv("gamma,third note\n")
+        os.utime(self.csv_path, ns=(st.st_atime_ns, st.st_mtime_ns))  # only the size changed
+        self.assertEqual(self.search(), [{"Name": "gamma", "Notes": "third note"}])
+        self.assertEqual(core.cache_info()["hits"], 0)
+
+    def test_cache_clear_indexes(self) -> None:
+        self.search()
+        key = (self.csv_path, core._index_options(self.CONFIG))
+        core.cache_clear()
+        self.assertEqual(core.cache_info(), {"hits": 0, "misses": 0, "size": 0, "maxsize": core.RESULT_CACHE_SIZE})
+        self.assertIn(key, core._INDEX_CACHE)
+        core.cache_clear(indexes=True)
+        self.assertNotIn(key, core._INDEX_CACHE)
+        self.search()
+        self.assertIn(key, core._INDEX_CACHE)
+
+
+class ShapeOutputTests(unittest.TestCase):
+    def test_parse_fields(self) -> None:
+        cases = {
+            None: (None, {}),
+            "": (None, {}),
+            "Family": (["Family"], {}),
+            "Family, Keywords:80": (["Family", "Keywords"], {"Keywords": 80}),
+            "Keywords: 80 ": (["Keywords"], {"Keywords": 80}),
+            "Keywords:0": (["Keywords"], {"Keywords": 0}),
+            # Not a budget: the whole item is the (unknown) column name
+            "Keywords:-5": (["Keywords:-5"], {}),
+            "Keywords:abc": (["Keywords:abc"], {}),
+            "Keywords:": (["Keywords:"], {}),
+            "Keywords:8.5": (["Keywords:8.5"], {}),
+            "A:B:12": (["A:B"], {"A:B": 12}),
+            # No name: skipped
+            ":80,,Family": (["Family"], {}),
+        }
+        for spec, expected in cases.items():
+            with self.subTest(spec=spec):
+                self.assertEqual(search.parse_fields(spec), expected)
+
+    def test_truncate_bytes_never_splits_a_character(self) -> None:
+        for value in ("plain ascii text", "café crème brûlée", "€€€€€", "😀a😀b😀", "日本語のテキスト"):
+            size = len(value.encode("utf-8"))
+            for limit in range(size + 2):
+                with self.subTest(value=value, limit=limit):
+                    result = search.truncate_bytes(value, limit)
+                    encoded = result.encode("utf-8")
+                    self.assertLessEqual(len(encoded), limit)
+                    if limit >= size:
+                        self.assertEqual(result, value)
+                        continue
+                    kept = result[:-3] if limit >= 3 else result
+                    self.assertTrue(limit < 3 or result.endswith("..."))
+                    self.assertTrue(value.startswith(kept))
+                    # The longest prefix that fits: one more character would not
+                    room = limit - 3 if limit >= 3 else limit
+                    self.assertGreater(len(value[:len(kept) + 1].encode("utf-8")), room)
+
+    def test_shape_row(self) -> None:
+        row = {"Domain": "style", "Family": "Inter", "Keywords": "ünïcode keywords", "Rank": 3}
+        self.assertEqual(search.shape_row(row), row)
+        self.assertEqual(search.shape_row(row, ["Keywords", "Nope", "Family"]),
+                         {"Domain": "style", "Keywords": "ünïcode keywords", "Family": "Inter"})
+        self.assertEqual(list(search.shape_row(row, ["Keywords", "Family"])), ["Domain", "Keywords", "Family"])
+        self.assertEqual(search.shape_row(row, ["Nope"]), {"Domain": "style"})
+        self.assertEqual(search.shape_row(row, None, {"Keywords": 5}, 3),
+                         {"Domain": "...", "Family": "...", "Keywords": "ü...", "Rank": 3})
+        self.assertEqual(search.shape_row(row, ["Keywords"], {"Keywords": 4}), {"Domain": "style", "Keywords": "..."})
+        self.assertEqual(search.shape_row(row, ["Family"], {}, 0), {"Domain": "", "Family": ""})
+
+    def test_byte_budget(self) -> None:
+        self.assertEqual(search.byte_budget("0"), 0)
+        self.assertEqual(search.byte_budget("120"), 120)
+        with self.assertRaises(search.argparse.ArgumentTypeError):
+            search.byte_budget("-1")
+        with self.assertRaises(ValueError):
+            search.byte_budget("ten")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "skills" / "design" / "ui-ux-pro-max" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import contrast  # noqa: E402
+import design_system  # noqa: E402
+
+
+class CheckPalettesTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rows = contrast.load_palettes()
+        # Skipped pairs (missing and non-hex values) and a repeated palette
+        self.rows += [{"Foreground": "#000000"}, {"Background": "rgba(0,0,0,0.1)", "Ring": "#FFF"}, self.rows[0]]
+
+    def check_without_numpy(self) -> list:
+        with mock.patch.object(contrast, "_numpy", return_value=None):
+            return contrast.check_palettes(self.rows)
+
+    def test_fallback_matches_check_palette(self) -> None:
+        expected = [contrast.check_palette(row) for row in self.rows]
+        self.assertEqual(self.check_without_numpy(), expected)
+
+    @unittest.skipUnless(contrast._numpy(), "NumPy is not installed")
+    def test_numpy_matches_fallback(self) -> None:
+        results = contrast.check_palettes(self.rows)
+        fallback = self.check_without_numpy()
+        self.assertEqual(len(results), len(fallback))
+        for row, result, expected in zip(self.rows, results, fallback):
+            with self.subTest(row=row.get("No")):
+                self.assertEqual(result, expected)
+
+    def test_empty_rows_skip_numpy(self) -> None:
+        with mock.patch.object(contrast, "_numpy") as numpy:
+            self.assertEqual(contrast.check_palettes([]), [])
+        numpy.assert_not_called()
+
+
+def linear_find_rule(rules, category):
+    # _find_reasoning_rule as it was before ReasoningIndex: three scans in file order
+    category_lower = category.lower()
+    for rule in rules:
+        if rule.get("UI_Category", "").lower() == category_lower:
+            return rule
+    for rule in rules:
+        ui_cat = rule.get("UI_Category", "").lower()
+        if ui_cat in category_lower or category_lower in ui_cat:
+            return rule
+    for rule in rules:
+        ui_cat = rule.get("UI_Category", "").lower()
+        keywords = ui_cat.replace("/", " ").replace("-", " ").split()
+        if any(kw in category_lower for kw in keywords):
+            return rule
+    return {}
+
+
+def linear_reasoning(rule):
+    decision_rules = {}
+    try:
+        decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
+    except json.JSONDecodeError:
+        pass
+    return {
+        "pattern": rule.get("Recommended_Pattern", ""),
+        "style_priority": [s.strip() for s in rule.get("Style_Priority", "").split("+")],
+        "color_mood": rule.get("Color_Mood", ""),
+        "typography_mood": rule.get("Typography_Mood", ""),
+        "key_effects": rule.get("Key_Effects", ""),
+        "anti_patterns": rule.get("Anti_Patterns", ""),
+        "decision_rules": decision_rules,
+        "severity": rule.get("Severity", "MEDIUM")
+    }
+
+
+def read_csv(name):
+    with open(design_system.DATA_DIR / name, "r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class ReasoningIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rules = read_csv(design_system.REASONING_FILE)
+        self.index = design_system.ReasoningIndex(self.rules)
+
+    def assert_same_rule(self, category) -> None:
+        idx = self.index.find(category)
+        expected = linear_find_rule(self.rules, category)
+        with self.subTest(category=category):
+            if idx is None:
+                self.assertEqual(expected, {})
+            else:
+                self.assertIs(self.rules[idx], expected)
+                self.assertEqual(self.index.reasoning(idx), linear_reasoning(expected))
+
+    def test_every_reasoning_category(self) -> None:
+        categories = [rule.get("UI_Category", "") for rule in self.rules]
+        self.assertTrue(categories)
+        for category in categories:
+            self.assert_same_rule(category)
+            self.assert_same_rule(category.upper())
+            self.assert_same_rule(f"Premium {category} Platform")
+
+    def test_product_types_and_fragments(self) -> None:
+        # Product types are what generate() looks up; fragments hit the partial and keyword passes
+        categories = {row.get("Product Type", "") for row in read_csv("products.csv")}
+        rng = random.Random(38)
+        for rule in self.rules:
+            ui_cat = rule.get("UI_Category", "")
+            for _ in range(5):
+                i = rng.randrange(len(ui_cat) + 1)
+                categories.add(ui_cat[i:i + rng.randint(0, 12)])
+            categories.update(ui_cat.replace("/", " ").replace("-", " ").split())
+        categories.update(["", "a", "ai", "General", "zzqx unknown", "app"])
+        for category in sorted(categories):
+            self.assert_same_rule(category)
+
+
+class WriteIfChangedTests(unittest.TestCase):
+    DOC = "# Design System\n\n> **Generated:** {stamp}\n\n**Generated:** {stamp}\n\nPrimary: {color}\n"
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.path = self.dir / "MASTER.md"
+
+    def render(self, stamp="2026-01-01 10:00:00", color="#2563EB") -> str:
+        return self.DOC.format(stamp=stamp, color=color)
+
+    def test_timestamp_only_change_is_unchanged(self) -> None:
+        self.assertEqual(design_system._write_if_changed(self.path, self.render()), "created")
+        past = self.path.stat().st_mtime_ns - 5_000_000_000
+        os.utime(self.path, ns=(past, past))
+        before = self.path.stat()
+        self.assertEqual(design_system._write_if_changed(self.path, self.render("2026-02-02 11:11:11")), "unchanged")
+        after = self.path.stat()
+        self.assertEqual((after.st_mtime_ns, after.st_ino), (before.st_mtime_ns, before.st_ino))
+        self.assertEqual(self.path.read_text(encoding="utf-8"), self.render())
+
+    def test_rerendered_master_is_unchanged(self) -> None:
+        design = design_system.DesignSystemGenerator().generate("SaaS dashboard", "Test Project")
+        statuses = []
+        for now in (datetime(2026, 1, 1, 10, 0, 0), datetime(2026, 2, 2, 11, 11, 11)):
+            with mock.patch.object(design_system, "datetime", mock.Mock(now=mock.Mock(return_value=now))):
+                content = design_system.format_master_md(design)
+            self.assertIn(now.strftime("%Y-%m-%d %H:%M:%S"), content)
+            statuses.append(design_system._write_if_changed(self.path, content))
+        self.assertEqual(statuses, ["created", "unchanged"])
+
+    def test_content_change_is_replaced_atomically(self) -> None:
+        design_system._write_if_changed(self.path, self.render())
+        os.chmod(self.path, 0o640)
+        inode = self.path.stat().st_ino
+        content = self.render("2026-02-02 11:11:11", "#DC2626")
+        self.assertEqual(design_system._write_if_changed(self.path, content), "updated")
+        self.assertEqual(self.path.read_text(encoding="utf-8"), content)
+        self.assertNotEqual(self.path.stat().st_ino, inode)  # renamed over, not rewritten in place
+        self.assertEqual(self.path.stat().st_mode & 0o777, 0o640)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["MASTER.md"])
+
+    def test_failed_write_keeps_old_file(self) -> None:
+        design_system._write_if_changed(self.path, self.render())
+        with mock.patch.object(design_system.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                design_system._write_if_changed(self.path, self.render(color="#DC2626"))
+        self.assertEqual(self.path.read_text(encoding="utf-8"), self.render())
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), ["MASTER.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "skills" / "ios" / "tools" / "sync-add-ios-loc" / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import detect_loc_entities as loc  # noqa: E402
+
+
+def legacy_is_probably_key(s: str) -> bool:
+    if not s:
+        return False
+    if re.match(r"^[A-Za-z0-9_.-]+$", s):
+        if s.startswith(("intl", "voice_", "home_", "more_", "setting", "language_")):
+            return True
+        if "_" in s or "." in s:
+            return True
+    return False
+
+
+def legacy_scan_line(line: str, ln):
+    # The former per-line scan: LOCAL_KEY_RE and STRING_LITERAL_RE each walk the line
+    keys = {m.group(1) for m in loc.LOCAL_KEY_RE.finditer(line)}
+    literals = []
+    stripped = line.strip()
+    for m in loc.STRING_LITERAL_RE.finditer(line):
+        value = m.group(1)
+        if stripped.startswith(("import ", "//", "/*", "*")):
+            continue
+        if legacy_is_probably_key(value) or value in ("%d", "%@", "%s"):
+            continue
+        literals.append((ln, value, stripped))
+    return keys, literals
+
+
+def scan(line: str, ln):
+    keys, literals = set(), []
+    loc.scan_line(line, keys, literals, ln)
+    return keys, literals
+
+
+class ScanLineTests(unittest.TestCase):
+    SAMPLES = [
+        'label.text = "intlHomeTitle".local',
+        'button.setTitle("home_more" . local, for: .normal)',
+        'let message = "Tap to retry"',
+        'print("%d", count)',
+        '// "commented out text"',
+        'alert.message = String(format: "%@ items".local, name)',
+        'return "setting.privacy".local + " " + "Done"',
+        '"\\"a.b" .local',
+        '"%d\\"Hello world".local',
+        'let s = "say \\"hi\\"".local',
+        '("x", ".local")',
+        '"".local + ".local"',
+        '"a" x ".local',
+        'title = "name".localized',
+        'let localValue = "plain"',
+        '"unterminated',
+        '"a\\\\".local',
+        '* "doc comment".local',
+        'import "x".local',
+    ]
+
+    def test_matches_legacy_scan_on_samples(self) -> None:
+        for line in self.SAMPLES:
+            with self.subTest(line=line):
+                self.assertEqual(scan(line, 7), legacy_scan_line(line, 7))
+
+    def test_matches_legacy_scan_on_random_lines(self) -> None:
+        rng = random.Random(49)
+        pieces = ['"', '\\"', "\\", ".local", " .local", ". local", "local", ".localized", "intlKey",
+                  "home_x", "a.b", "Hello world", "%d", "%@", " ", ", ", "(", ")", "+", "x", "_", "//", "*"]
+        for _ in range(30000):
+            line = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 12)))
+            with self.subTest(line=line):
+                self.assertEqual(scan(line, None), legacy_scan_line(line, None))
+
+    def test_is_probably_key_is_cached_and_matches_legacy(self) -> None:
+        loc.is_probably_key.cache_clear()
+        values = ["intlTitle", "voice_x", "a.b", "Hello", "", "snake_case", "has space_x", "Done", "intlTitle"]
+        for value in values:
+            self.assertEqual(loc.is_probably_key(value), legacy_is_probably_key(value))
+        info = loc.is_probably_key.cache_info()
+        self.assertEqual(info.misses, len(set(values)))
+        self.assertEqual(info.hits, len(values) - len(set(values)))
+
+
+def synthetic_diff(files: int) -> list:
+    lines = []
+    for n in range(files):
+        lines += [f"diff --git a/App/V{n}.swift b/App/V{n}.swift", f"--- a/App/V{n}.swift"]
+        # Every fifth file is deleted: its lines follow '+++ /dev/null'
+        lines.append("+++ /dev/null" if n % 5 == 4 else f"+++ b/App/V{n}.swift")
+        for h in range(n % 4 + 1):
+            lines.append(f"@@ -{h * 10 + 1},2 +{h * 10 + 1},3 @@")
+            lines += [
+                f'+        label.text = "intlTitle{n}_{h}".local',
+                f'-        label.text = "Old text {n}"',
+                f'+        label.text = "New text {n} {h}"',
+                "         view.layoutIfNeeded()",
+            ]
+        if n % 7 == 0:
+            lines += [f"diff --git a/R{n}.strings b/R{n}.strings", f"+++ b/R{n}.strings", '+"k" = "v";']
+    return lines
+
+
+class ParallelParseTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.batch_lines = loc.PARALLEL_BATCH_LINES
+        loc.PARALLEL_BATCH_LINES = 40  # many batches, cut at many file boundaries
+
+    def tearDown(self) -> None:
+        loc.PARALLEL_BATCH_LINES = self.batch_lines
+
+    def test_batches_cut_only_between_files(self) -> None:
+        lines = synthetic_diff(60)
+        batches = list(loc._file_batches(lines, loc.PARALLEL_BATCH_LINES))
+        self.assertGreater(len(batches), 10)
+        self.assertEqual([raw for batch in batches for raw in batch], lines)
+        for batch in batches[1:]:
+            self.assertTrue(batch[0].startswith("+++ b/") or batch[0].startswith("diff --git"), batch[0])
+
+    def test_parallel_output_equals_serial(self) -> None:
+        lines = synthetic_diff(60)
+        serial = list(loc.iter_file_changes(lines))
+        self.assertEqual(list(loc.iter_file_changes_parallel(lines, 2)), serial)
+        self.assertEqual(loc.parse_swift_diff(lines, workers=2), loc.parse_swift_diff(lines, workers=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.sync_skills import (
+    SYNC_MANIFEST_NAME,
+    build_size_report,
+    iter_source_files,
+    sync_skills,
+)
+
+
+def write_file(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+class SyncSkillsManifestTests(unittest.TestCase):
+    def make_skill(self, root: Path) -> Path:
+        skill = root / "design" / "ui-ux-pro-max"
+        write_file(skill / "SKILL.md", "---\nname: ui-ux-pro-max\n---\n")
+        write_file(skill / "scripts" / "search.py", "print('search')\n")
+        write_file(skill / "data" / "styles.csv", "Style\nflat\n")
+        write_file(skill / "data" / "draft.csv", "draft\n")
+        write_file(skill / "data" / "_compiled" / "styles.uxc", "compiled")
+        write_file(skill / "bench" / "startup.py", "print('bench')\n")
+        write_file(
+            skill / SYNC_MANIFEST_NAME,
+            json.dumps({"exclude": ["data/draft.csv", "data/_compiled/", "bench/*.py"]}),
+        )
+        return skill
+
+    def test_iter_source_files_honors_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "skills"
+            self.make_skill(root)
+            write_file(root / "web" / "performance" / "SKILL.md", "---\nname: performance\n---\n")
+
+            files = sorted(path.as_posix() for path in iter_source_files(root))
+
+            self.assertEqual(
+                files,
+                [
+                    "design/ui-ux-pro-max/SKILL.md",
+                    "design/ui-ux-pro-max/data/styles.csv",
+                    "design/ui-ux-pro-max/scripts/search.py",
+                    "web/performance/SKILL.md",
+                ],
+            )
+
+    def test_sync_skills_does_not_copy_excluded_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "skills"
+            self.make_skill(root)
+            target = Path(tmp) / "workspace" / ".agents" / "skills" / "super-dev"
+
+            summary = sync_skills(source=root, target=target, dry_run=False)
+
+            self.assertNotIn(f"design/ui-ux-pro-max/{SYNC_MANIFEST_NAME}", summary["copied"])
+            self.assertFalse((target / "design" / "ui-ux-pro-max" / "data" / "draft.csv").exists())
+            self.assertFalse((target / "design" / "ui-ux-pro-max" / "bench").exists())
+
+    def test_sync_skills_keeps_excluded_subtree_in_target(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "skills"
+            self.make_skill(root)
+            target = Path(tmp) / "workspace" / ".agents" / "skills" / "super-dev"
+            skill = target / "design" / "ui-ux-pro-max"
+            write_file(skill / "data" / "_compiled" / "colors.uxc", "built in workspace")
+            write_file(skill / "data" / "_compiled" / "snapshots" / "ds.json", "{}")
+            write_file(skill / "scripts" / "old.py", "stale\n")
+
+            summary = sync_skills(source=root, target=target, dry_run=False)
+
+            self.assertEqual(summary["deleted"], ["design/ui-ux-pro-max/scripts/old.py"])
+            self.assertEqual((skill / "data" / "_compiled" / "colors.uxc").read_text(encoding="utf-8"), "built in workspace")
+            self.assertTrue((skill / "data" / "_compiled" / "snapshots" / "ds.json").exists())
+            self.assertFalse((skill / "scripts" / "old.py").exists())
+            self.assertTrue((target / "design" / "ui-ux-pro-max" / "data" / "styles.csv").exists())
+
+    def test_invalid_manifest_raises_value_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "skills"
+            skill = self.make_skill(root)
+            write_file(skill / SYNC_MANIFEST_NAME, json.dumps({"exclude": "data/draft.csv"}))
+
+            with self.assertRaises(ValueError):
+                iter_source_files(root)
+
+    def test_build_size_report_counts_shipped_and_excluded_per_skill(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / "skills"
+            skill = self.make_skill(root)
+            write_file(root / "web" / "performance" / "SKILL.md", "x" * 10)
+
+            report = build_size_report(root)
+
+            rows = {row["path"]: row for row in report["skills"]}
+            ux = rows["design/ui-ux-pro-max"]
+            self.assertEqual(ux["shipped_files"], 3)
+            self.assertEqual(ux["excluded_files"], 4)
+            self.assertEqual(
+                ux["excluded_bytes"],
+                sum(
+                    (skill / name).stat().st_size
+                    for name in ("data/draft.csv", "data/_compiled/styles.uxc", "bench/startup.py", SYNC_MANIFEST_NAME)
+                ),
+            )
+            self.assertEqual(rows["web/performance"]["shipped_bytes"], 10)
+            self.assertEqual(report["total"]["shipped_files"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()